@@ -47,11 +47,13 @@ dev_requirements = [
     'flake8',
     'gitpython',
     'isort==4.3.*',
+    'jax',
     'jupyter',
     'loky',
     'matplotlib<3.8',
     'nbsphinx',
     'nbval',
+    'numba',
     'pre-commit',
     'pybtex',
     'pylint',
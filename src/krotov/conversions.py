@@ -34,10 +34,21 @@ def _nested_list_shallow_copy(l):
 
 def _tlist_midpoints(tlist):
     """Calculate array of midpoints in `tlist`."""
-    tlist_midpoints = []
-    for i in range(len(tlist) - 1):
-        tlist_midpoints.append(0.5 * (tlist[i + 1] + tlist[i]))
-    return np.array(tlist_midpoints)
+    tlist = np.asarray(tlist)
+    return 0.5 * (tlist[1:] + tlist[:-1])
+
+
+def _sampling_midpoints(tlist):
+    """Points at which :func:`discretize` samples a control for
+    ``via_midpoints=True``.
+
+    These are the midpoints of the intervals of `tlist`, except for the first
+    and last point, which are ``tlist[0]`` and ``tlist[-1]``.
+    """
+    tlist_midpoints = (tlist + 0.5 * (tlist[1] - tlist[0]))[:-1]
+    tlist_midpoints[0] = tlist[0]
+    tlist_midpoints[-1] = tlist[-1]
+    return tlist_midpoints
 
 
 def _find_in_list(val, list_to_search):
@@ -106,12 +117,9 @@ def discretize(control, tlist, args=(None,), kwargs=None, via_midpoints=False):
         if kwargs is None:
             kwargs = {}
         if via_midpoints:
-            tlist_midpoints = (tlist + 0.5 * (tlist[1] - tlist[0]))[:-1]
-            tlist_midpoints[0] = tlist[0]
-            tlist_midpoints[-1] = tlist[-1]
             pulse_on_midpoints = discretize(
                 control,
-                tlist_midpoints,
+                _sampling_midpoints(tlist),
                 args=args,
                 kwargs=kwargs,
                 via_midpoints=False,
@@ -384,7 +392,6 @@ def pulse_onto_tlist(pulse):
     """
     control = np.zeros(len(pulse) + 1, dtype=pulse.dtype.type)
     control[0] = pulse[0]
-    for i in range(1, len(control) - 1):
-        control[i] = 0.5 * (pulse[i - 1] + pulse[i])
+    control[1:-1] = 0.5 * (pulse[:-1] + pulse[1:])
     control[-1] = pulse[-1]
     return control
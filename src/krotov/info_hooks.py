@@ -21,6 +21,25 @@ def _qobj_nbytes(qobj):
     )
 
 
+def _storage_info(states, MB_per_timeslot):
+    """Return a description of the storage for backward or forward states.
+
+    For the default ``storage='array'``, the states are held in contiguous
+    arrays whose actual memory usage is reported. Otherwise, the memory is
+    estimated from `MB_per_timeslot`.
+    """
+    if states is None:
+        return "None"
+    storage = states[0]
+    try:
+        name = storage.vectors.__class__.__name__
+        MB = storage.vectors.nbytes / 1024 ** 2
+    except AttributeError:
+        name = storage.__class__.__name__
+        MB = len(storage) * MB_per_timeslot
+    return "[%d * %s(%d)] (%.1f MB)" % (len(states), name, len(storage), MB)
+
+
 def chain(*hooks):
     """Chain multiple `info_hook` or `modify_params_after_iter` callables
     together.
@@ -119,8 +138,8 @@ def print_debug_information(
             thus whether convergence is reached (negligible pulse updates).
         lambda_vals (numpy.ndarray): for each pulse, the value of the
             $\lambda_a$ parameter
-        shape_arrays (list[numpy.ndarray]): for each pulse, the array of
-            update-shape values $S(t)$
+        shape_arrays (numpy.ndarray): for each pulse (first index), the
+            update-shape values $S(t)$ on the intervals of the time grid
         fw_states_T (list): for each objective, the forward-propagated state
         tlist (numpy.ndarray): array of time grid values on which the states
             are defined
@@ -230,46 +249,13 @@ def print_debug_information(
     except AttributeError:
         # e.g. fw_states_T = None (skip_initial_forward_propagation)
         MB_per_timeslot = 0
-    out.write("    storage (bw, fw, fw0): ")
-    if backward_states is None:
-        out.write("None, ")
-    else:
-        n = len(backward_states)
-        out.write(
-            "[%d * %s(%d)] (%.1f MB), "
-            % (
-                n,
-                backward_states[0].__class__.__name__,
-                len(backward_states[0]),
-                len(backward_states[0]) * MB_per_timeslot,
-            )
-        )
-    if forward_states is None:
-        out.write("None, ")
-    else:
-        n = len(forward_states)
-        out.write(
-            "[%d * %s(%d)] (%.1f MB), "
-            % (
-                n,
-                forward_states[0].__class__.__name__,
-                len(forward_states[0]),
-                len(forward_states[0]) * MB_per_timeslot,
-            )
-        )
-    if forward_states0 is None:
-        out.write("None\n")
-    else:
-        n = len(forward_states0)
-        out.write(
-            "[%d * %s(%d)] (%.1f MB)\n"
-            % (
-                n,
-                forward_states0[0].__class__.__name__,
-                len(forward_states0[0]),
-                len(forward_states0[0]) * MB_per_timeslot,
-            )
+    out.write(
+        "    storage (bw, fw, fw0): %s\n"
+        % ", ".join(
+            _storage_info(states, MB_per_timeslot)
+            for states in (backward_states, forward_states, forward_states0)
         )
+    )
     try:
         out.write(
             "    fw_states_T norm: %s\n"
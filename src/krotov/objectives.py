@@ -410,17 +410,17 @@ class Objective:
             control_onto_interval(discretize(control, tlist, args=(args,)))
             for control in controls
         ]
+        dts = np.diff(tlist)
         for time_index in range(len(tlist) - 1):  # index over intervals
             H_at_t = plug_in_pulse_values(H, pulses, mapping[0], time_index)
             c_ops_at_t = [
                 plug_in_pulse_values(c_op, pulses, mapping[ic + 1], time_index)
                 for (ic, c_op) in enumerate(c_ops)
             ]
-            dt = tlist[time_index + 1] - tlist[time_index]
             state = propagator(
                 H_at_t,
                 state,
-                dt,
+                dts[time_index],
                 c_ops_at_t,
                 initialize=True,  # initialize=(time_index == 0)
             )
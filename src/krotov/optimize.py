@@ -1,15 +1,20 @@
 import copy
 import inspect
 import logging
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
 import numpy as np
+import scipy.sparse
 import threadpoolctl
 from qutip import Qobj
 from qutip.parallel import serial_map
 
 from .conversions import (
+    _sampling_midpoints,
     control_onto_interval,
     discretize,
     extract_controls,
@@ -20,16 +25,37 @@ from .conversions import (
 )
 from .info_hooks import chain
 from .mu import derivative_wrt_pulse
-from .parallelization import USE_THREADPOOL_LIMITS
+from .parallelization import USE_THREADPOOL_LIMITS, _executor_map
 from .propagators import Propagator, expm
 from .result import Result
 from .second_order import _overlap
 from .shapes import one_shape, zero_shape
 
 
+try:
+
+    import numba
+
+    _HAS_NUMBA = True
+
+except ImportError:
+
+    _HAS_NUMBA = False
+
+
 __all__ = ['optimize_pulses']
 
 
+_DENSE_MU_MAX_DIM = 256
+"""Maximum dimension of ∂H/∂ϵ for the batched (dense) pulse update.
+
+Above this dimension, the memory required for storing μ as dense matrices
+(and the cost of dense matrix-vector products) outweighs the savings from
+eliminating the per-objective Python overhead, and μ is kept as a sparse
+matrix instead, to be applied to one objective at a time.
+"""
+
+
 def optimize_pulses(
     objectives,
     pulse_options,
@@ -51,7 +77,9 @@ def optimize_pulses(
     skip_initial_forward_propagation=False,
     norm=None,
     overlap=None,
-    limit_thread_pool=None
+    limit_thread_pool=None,
+    backend='numpy',
+    dtype=np.complex128,
 ):
     r"""Use Krotov's method to optimize towards the given `objectives`.
 
@@ -176,8 +204,10 @@ def optimize_pulses(
         storage (callable): Storage constructor for the storage of
             propagated states. Must accept an integer parameter `N` and return
             an empty array-like container of length `N`. The default value
-            'array' is equivalent to
-            ``functools.partial(numpy.empty, dtype=object)``.
+            'array' stores :class:`~qutip.Qobj` states as the rows of a single
+            contiguous complex array, converting them back to
+            :class:`~qutip.Qobj` only on access. Any other states are stored
+            as in ``functools.partial(numpy.empty, dtype=object)``.
         parallel_map (callable or tuple or None): Parallel function evaluator.
             If given as a callable, the argument must have the same
             specification as :func:`qutip.parallel.serial_map`.
@@ -188,8 +218,14 @@ def optimize_pulses(
             callables are used to parallelize (1) the initial
             forward-propagation, (2) the backward-propagation under the guess
             pulses, and (3) the forward-propagation by a single time step under
-            the optimized pulses. See :mod:`krotov.parallelization` for
-            details.
+            the optimized pulses. Instead of a callable, any element of the
+            tuple may be the string 'threads'. For (1) and (2), this maps over
+            the objectives using a pool of threads that is kept alive for the
+            entire optimization. For (3), each objective is propagated in its
+            own thread over the entire time grid, with the threads
+            synchronizing after each time step to update the pulses. Passing
+            'threads' instead of a tuple uses threads for all three
+            propagations. See :mod:`krotov.parallelization` for details.
         store_all_pulses (bool): Whether or not to store the optimized pulses
             from *all* iterations in :class:`.Result`.
         continue_from (None or Result): If given, continue an optimization from
@@ -215,6 +251,26 @@ def optimize_pulses(
             to place no restrictions on multi-threading. The default value
             (None) delegates to
             :obj:`krotov.parallelization.USE_THREADPOOL_LIMITS`.
+        backend (str): If 'jax', evaluate the backward propagation and the
+            forward propagation with the pulse update in each iteration as
+            functions compiled with :mod:`jax`, vectorized over all
+            objectives. This requires that :mod:`jax` is installed, that
+            `propagator` is :func:`krotov.propagators.expm` (which the compiled
+            propagation is equivalent to), that `mu`, `overlap`, and `storage`
+            are the default values, and that the objectives have no `c_ops`.
+            The `parallel_map` for the backward and forward propagation is
+            ignored. The default 'numpy' does not use :mod:`jax`.
+        dtype (numpy.dtype): The complex dtype (:obj:`numpy.complex128` or
+            :obj:`numpy.complex64`) for the stored states (with the default
+            `storage`) and for the matrices and vectors in the evaluation of
+            the pulse update. For large Hilbert spaces, passing
+            :obj:`numpy.complex64` halves the memory required for storing the
+            states and the memory bandwidth in the pulse update. The
+            propagation (depending on the `propagator`), the norms of the
+            states, the accumulated pulse update, and the `tau_vals` always use
+            double precision. Krotov's method then still converges
+            monotonically, up to the single-precision error (relative error
+            of about 1e-7) of the gradient in the pulse update.
 
     Returns:
         Result: The result of the optimization.
@@ -224,18 +280,17 @@ def optimize_pulses(
             shape is not a real-valued function in the range [0, 1]; if using
             `continue_from` with a :class:`.Result` with differing
             `objectives`; if there are any required keys missing in
-            `pulse_options`.
+            `pulse_options`; if `dtype` is not :obj:`numpy.complex64` or
+            :obj:`numpy.complex128`; if the optimization does not meet the
+            requirements of ``backend='jax'``.
+        ImportError: If ``backend='jax'`` but :mod:`jax` is not installed.
     """
     logger = logging.getLogger('krotov')
 
     # Initialization
     logger.info("Initializing optimization with Krotov's method")
-    thread_pool_limiter = None
     if limit_thread_pool is None:
         limit_thread_pool = USE_THREADPOOL_LIMITS
-    if limit_thread_pool:
-        logger.debug("Setting threadpoolctrl.threadpool_limits")
-        thread_pool_limiter = threadpoolctl.threadpool_limits(limits=1)
     if mu is None:
         mu = derivative_wrt_pulse
     second_order = sigma is not None
@@ -261,12 +316,25 @@ def optimize_pulses(
     _check_propagators_interface(propagators, logger)
 
     adjoint_objectives = [obj.adjoint() for obj in objectives]
-    if storage == 'array':
-        storage = partial(np.empty, dtype=object)
+    operator_groups = _operator_groups(objectives)
+    dts = np.diff(tlist)  # time steps, for each interval of the time grid
+    if np.dtype(dtype) not in (np.complex64, np.complex128):
+        raise ValueError("dtype must be numpy.complex64 or numpy.complex128")
+    dense_storage = storage == 'array'
+    if dense_storage:
+        storage = _DenseStateStorage
+        if np.dtype(dtype) != np.complex128:
+            storage = partial(_DenseStateStorage, dtype=dtype)
+    if backend not in ('numpy', 'jax'):
+        raise ValueError("backend must be 'numpy' or 'jax'")
     if parallel_map is None:
         parallel_map = serial_map
     if not isinstance(parallel_map, (tuple, list)):
         parallel_map = (parallel_map, parallel_map, parallel_map)
+    if any(
+        pmap != 'threads' for pmap in parallel_map if isinstance(pmap, str)
+    ):
+        raise ValueError("The only valid string in parallel_map is 'threads'")
 
     (
         guess_controls,  # "controls": sampled on the time grid
@@ -279,6 +347,17 @@ def optimize_pulses(
         guess_controls, guess_pulses = _restore_from_previous_result(
             continue_from, objectives, tlist, store_all_pulses
         )
+    if backend == 'jax':
+        _check_jax_backend(
+            objectives,
+            guess_pulses,
+            pulses_mapping,
+            propagators,
+            storage,
+            mu,
+            overlap,
+            dtype,
+        )
 
     g_a_integrals = np.zeros(len(guess_pulses))
     # ∫gₐ(t)dt is a very useful measure of whether λₐ is too small (large
@@ -292,302 +371,394 @@ def optimize_pulses(
     else:
         result = copy.deepcopy(continue_from)
 
-    # Initial forward-propagation
-    tic = time.time()
-    if skip_initial_forward_propagation:
-        forward_states = _skip_initial_forward_propagation(
-            objectives, continue_from, sigma, logger
-        )
-    else:
-        forward_states = parallel_map[0](
-            _forward_propagation,
-            list(range(len(objectives))),
-            (
-                objectives,
-                guess_pulses,
-                pulses_mapping,
-                tlist,
-                propagators,
-                storage,
-            ),
-        )
-    toc = time.time()
-
-    fw_states_T = [states[-1] for states in forward_states]
-    tau_vals = np.array(
-        [
-            overlap(obj.target, state_T)
-            for (state_T, obj) in zip(fw_states_T, objectives)
-        ]
-    )
-
-    if second_order:
-        forward_states0 = forward_states  # ∀t: Δϕ=0, for iteration 0
-    else:
-        # the forward-propagated states only need to be stored for the second
-        # order update
-        forward_states0 = forward_states = None
-
-    info = None
-    optimized_pulses = copy.deepcopy(guess_pulses)
-    info_hook_static_args = dict(
-        # these do no change between iterations (although
-        # `modify_params_after_iter` may modify any of these, to
-        # the extent that they're mutable)
-        objectives=objectives,
-        adjoint_objectives=adjoint_objectives,
-        lambda_vals=lambda_vals,
-        shape_arrays=shape_arrays,
-        tlist=tlist,
-        propagator=propagator,
-        chi_constructor=chi_constructor,
-        mu=mu,
-        sigma=sigma,
-        iter_start=iter_start,
-        iter_stop=iter_stop,
-    )
-    if info_hook is not None:
-        info = info_hook(
-            backward_states=None,
-            forward_states=forward_states,
-            forward_states0=forward_states0,
-            guess_pulses=guess_pulses,
-            optimized_pulses=optimized_pulses,
-            g_a_integrals=g_a_integrals,
-            fw_states_T=fw_states_T,
-            tau_vals=tau_vals,
-            start_time=tic,
-            stop_time=toc,
-            iteration=0,
-            info_vals=[],
-            shared_data={},
-            **info_hook_static_args,
+    # The thread pool limits and the pool of threads for 'threads' in
+    # `parallel_map` are released in any case, even if the optimization fails
+    thread_pool_limiter = None
+    if limit_thread_pool:
+        logger.debug("Setting threadpoolctrl.threadpool_limits")
+        thread_pool_limiter = threadpoolctl.threadpool_limits(limits=1)
+    executor = None
+    if 'threads' in parallel_map:
+        # A single pool of threads, kept alive for the entire optimization.
+        # The forward propagation with 'threads' requires one thread for each
+        # objective to run concurrently. Otherwise, there is no benefit from
+        # more threads than CPUs.
+        max_workers = min(len(objectives), os.cpu_count() or 1)
+        if parallel_map[2] == 'threads' and backend != 'jax':
+            max_workers = len(objectives)
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='krotov'
         )
-
-    # Initialize Result object
-    result.tlist = tlist
-    result.objectives = objectives
-    result.guess_controls = guess_controls
-    result.optimized_controls = optimized_pulses
-    result.controls_mapping = pulses_mapping
-    if continue_from is None:
-        # we only store information about the "0" iteration if we're starting a
-        # new optimization
-        if info is not None:
-            result.info_vals.append(info)
-        result.iters.append(0)
-        result.iter_seconds.append(int(toc - tic))
-        if not np.all(tau_vals == None):  # noqa
-            result.tau_vals.append(tau_vals)
-        if store_all_pulses:
-            result.all_pulses.append(guess_pulses)
-    else:
-        iter_start = continue_from.iters[-1]
-        logger.info(
-            "Continuing from previous result, with iteration %d",
-            iter_start + 1,
+        parallel_map = tuple(
+            partial(_executor_map, executor)
+            if (pmap == 'threads' and i < 2)
+            else pmap
+            for (i, pmap) in enumerate(parallel_map)
         )
-    result.states = fw_states_T
-
-    # Main optimization loop
-    for krotov_iteration in range(iter_start + 1, iter_stop + 1):
+    try:
 
-        logger.info("Started Krotov iteration %d", krotov_iteration)
+        # Initial forward-propagation
         tic = time.time()
-
-        # Boundary condition for the backward propagation
-        # -- this is where the functional enters the optimization.
-        # `fw_states_T` are the states forward-propagated under the guess pulse
-        # of the current iteration, which is the optimized pulse of the
-        # previous iteration. This is how we get the `fw_states_T` here: they
-        # are left over from the forward-propagation in the previous iteration.
-        chi_states = chi_constructor(
-            fw_states_T=fw_states_T, objectives=objectives, tau_vals=tau_vals
-        )
-        chi_norms = [norm(chi) for chi in chi_states]
-        # normalizing χ improves numerical stability; the norm then has to be
-        # taken into account when calculating Δϵ
-        chi_states = [chi / nrm for (chi, nrm) in zip(chi_states, chi_norms)]
-
-        # Backward propagation
-        backward_states = parallel_map[1](
-            _backward_propagation,
-            list(range(len(objectives))),
-            (
-                chi_states,
-                adjoint_objectives,
-                guess_pulses,
-                pulses_mapping,
-                tlist,
-                propagators,
-                storage,
-            ),
-        )
-
-        # Forward propagation and pulse update
-        logger.info("Started forward propagation/pulse update")
-        if second_order:
-            forward_states = [
-                storage(len(tlist)) for _ in range(len(objectives))
-            ]
-        g_a_integrals[:] = 0.0
-        if second_order:
-            # In the update for the pulses in the first time interval, we use
-            # the states at t=0. Hence, Δϕ(t=0) = 0
-            delta_phis = [
-                Qobj(np.zeros(shape=chi_states[k].shape))
-                for k in range(len(objectives))
-            ]
-        if second_order:
-            for i_obj in range(len(objectives)):
-                forward_states[i_obj][0] = objectives[i_obj].initial_state
-        delta_eps = [
-            np.zeros(len(tlist) - 1, dtype=np.complex128) for _ in guess_pulses
-        ]
-        optimized_pulses = copy.deepcopy(guess_pulses)
-        fw_states = [obj.initial_state for obj in objectives]
-        for time_index in range(len(tlist) - 1):  # iterate over time intervals
-            dt = tlist[time_index + 1] - tlist[time_index]
-            if second_order:
-                σ = sigma(tlist[time_index] + 0.5 * dt)
-            # pulse update
-            for (i_pulse, guess_pulse) in enumerate(guess_pulses):
-                for (i_obj, objective) in enumerate(objectives):
-                    χ = backward_states[i_obj][time_index]
-                    μ = mu(
-                        objectives,
-                        i_obj,
-                        guess_pulses,
-                        pulses_mapping,
-                        i_pulse,
-                        time_index,
-                    )
-                    Ψ = fw_states[i_obj]
-                    Ψ.dims=[[2,2],[2,2]]
-
-                    update = overlap(χ, μ(Ψ))  # ⟨χ|μ|Ψ⟩ ∈ ℂ
-                    update *= chi_norms[i_obj]
-                    if second_order:
-                        delta_phis[i_obj].dims = μ(Ψ).dims
-                        update += 0.5 * σ * overlap(delta_phis[i_obj], μ(Ψ))
-                    delta_eps[i_pulse][time_index] += update
-                λₐ = lambda_vals[i_pulse]
-                S_t = shape_arrays[i_pulse][time_index]
-                Δϵ = (S_t / λₐ) * delta_eps[i_pulse][time_index].imag  # ∈ ℝ
-                g_a_integrals[i_pulse] += abs(Δϵ) ** 2 * dt  # dt may vary!
-                optimized_pulses[i_pulse][time_index] += Δϵ
-            # forward propagation
-            fw_states = parallel_map[2](
-                _forward_propagation_step,
+        forward_vectors = None
+        if skip_initial_forward_propagation:
+            forward_states = _skip_initial_forward_propagation(
+                objectives, continue_from, sigma, logger
+            )
+            fw_states_T = [states[-1] for states in forward_states]
+        else:
+            forward_storage_arrays = None
+            if dense_storage:
+                (
+                    forward_vectors,
+                    forward_storage_arrays,
+                ) = _dense_storage_arrays(
+                    [obj.initial_state for obj in objectives],
+                    len(tlist),
+                    dtype,
+                )
+            propagation_results = parallel_map[0](
+                _forward_propagation,
                 list(range(len(objectives))),
                 (
-                    fw_states,
                     objectives,
-                    optimized_pulses,
+                    guess_pulses,
                     pulses_mapping,
                     tlist,
-                    time_index,
+                    dts,
                     propagators,
+                    storage,
+                    True,  # store_all
+                    _OperatorCache(
+                        objectives,
+                        guess_pulses,
+                        pulses_mapping,
+                        operator_groups,
+                    ),
+                    forward_storage_arrays,
                 ),
             )
-            if second_order:
-                # Δϕ(t + dt), to be used for the update in the next interval
-                delta_phis = [
-                    fw_states[k] - forward_states0[k][time_index + 1]
-                    for k in range(len(objectives))
-                ]
-                # storage
-                for i_obj in range(len(objectives)):
-                    forward_states[i_obj][time_index + 1] = fw_states[i_obj]
-        logger.info("Finished forward propagation/pulse update")
-        fw_states_T = fw_states
-        tau_vals = np.array(
-            [
-                overlap(obj.target, fw_state_T)
-                for (fw_state_T, obj) in zip(fw_states_T, objectives)
-            ]
-        )
-
+            forward_states = [states for (states, _) in propagation_results]
+            # The final states are taken directly from the propagation, not
+            # from the storage, which may have reduced precision (`dtype`)
+            fw_states_T = [state for (_, state) in propagation_results]
+            forward_vectors = _dense_vectors(
+                forward_vectors, forward_storage_arrays, forward_states
+            )
         toc = time.time()
 
-        # Display information about iteration
+        targets_stack = None
+        if overlap is _overlap:
+            targets_stack = _stacked_targets(objectives)
+        tau_vals = _tau_vals(objectives, fw_states_T, overlap, targets_stack)
+
+        if second_order:
+            forward_states0 = forward_states  # ∀t: Δϕ=0, for iteration 0
+            Ψ0_array = forward_vectors
+        else:
+            # the forward-propagated states only need to be stored for the
+            # second order update
+            forward_states0 = forward_states = None
+            Ψ0_array = forward_vectors = None
+
+        info = None
+        optimized_pulses = [pulse.copy() for pulse in guess_pulses]
+        info_hook_static_args = dict(
+            # these do no change between iterations (although
+            # `modify_params_after_iter` may modify any of these, to
+            # the extent that they're mutable)
+            objectives=objectives,
+            adjoint_objectives=adjoint_objectives,
+            lambda_vals=lambda_vals,
+            shape_arrays=shape_arrays,
+            tlist=tlist,
+            propagator=propagator,
+            chi_constructor=chi_constructor,
+            mu=mu,
+            sigma=sigma,
+            iter_start=iter_start,
+            iter_stop=iter_stop,
+        )
         if info_hook is not None:
             info = info_hook(
-                backward_states=backward_states,
+                backward_states=None,
                 forward_states=forward_states,
                 forward_states0=forward_states0,
-                fw_states_T=fw_states_T,
                 guess_pulses=guess_pulses,
                 optimized_pulses=optimized_pulses,
                 g_a_integrals=g_a_integrals,
+                fw_states_T=fw_states_T,
                 tau_vals=tau_vals,
                 start_time=tic,
                 stop_time=toc,
-                info_vals=result.info_vals,
+                iteration=0,
+                info_vals=[],
                 shared_data={},
-                iteration=krotov_iteration,
                 **info_hook_static_args,
             )
-        # Update optimization `result` with info from finished iteration
-        result.iters.append(krotov_iteration)
-        result.iter_seconds.append(int(toc - tic))
-        if info is not None:
-            result.info_vals.append(info)
-        if not np.all(tau_vals == None):  # noqa
-            result.tau_vals.append(tau_vals)
+
+        # Initialize Result object
+        result.tlist = tlist
+        result.objectives = objectives
+        result.guess_controls = guess_controls
         result.optimized_controls = optimized_pulses
-        # pulses (time intervals) will be converted to controls (time grid
-        # points) farther below in "Finalize"
-        if store_all_pulses:
-            # we need to make a copy, so that the conversion in "Finalize"
-            # doesn't affect `all_pulses` as well.
-            result.all_pulses.append(copy.deepcopy(optimized_pulses))
+        result.controls_mapping = pulses_mapping
+        if continue_from is None:
+            # we only store information about the "0" iteration if we're
+            # starting a new optimization
+            if info is not None:
+                result.info_vals.append(info)
+            result.iters.append(0)
+            result.iter_seconds.append(int(toc - tic))
+            if not np.all(tau_vals == None):  # noqa
+                result.tau_vals.append(tau_vals)
+            if store_all_pulses:
+                result.all_pulses.append(guess_pulses)
+        else:
+            iter_start = continue_from.iters[-1]
+            logger.info(
+                "Continuing from previous result, with iteration %d",
+                iter_start + 1,
+            )
         result.states = fw_states_T
 
-        logger.info("Finished Krotov iteration %d", krotov_iteration)
-
-        # Convergence check
-        msg = None
-        if check_convergence is not None:
-            msg = check_convergence(result)
-        if krotov_iteration >= info_hook_static_args['iter_stop']:
-            # modify_params_after_iter may change iter_stop!
-            iter_stop = info_hook_static_args['iter_stop']
-            result.message = "Reached %d iterations" % iter_stop
-            break
-        if bool(msg) is True:  # this is not an anti-pattern!
-            result.message = "Reached convergence"
-            if isinstance(msg, str):
-                result.message += ": " + msg
-            break
-        else:
-            # prepare for next iteration
-            guess_pulses = optimized_pulses
+        # Main optimization loop
+        for krotov_iteration in range(iter_start + 1, iter_stop + 1):
 
-        if second_order:
-            sigma.refresh(
-                forward_states=forward_states,
-                forward_states0=forward_states0,
-                chi_states=chi_states,
-                chi_norms=chi_norms,
-                optimized_pulses=optimized_pulses,
-                guess_pulses=guess_pulses,
+            logger.info("Started Krotov iteration %d", krotov_iteration)
+            tic = time.time()
+
+            # Boundary condition for the backward propagation
+            # -- this is where the functional enters the optimization.
+            # `fw_states_T` are the states forward-propagated under the guess
+            # pulse of the current iteration, which is the optimized pulse of
+            # the previous iteration. This is how we get the `fw_states_T`
+            # here: they are left over from the forward-propagation in the
+            # previous iteration.
+            chi_states = chi_constructor(
+                fw_states_T=fw_states_T,
                 objectives=objectives,
-                result=result,
+                tau_vals=tau_vals,
+            )
+            chi_norms = [norm(chi) for chi in chi_states]
+            # normalizing χ improves numerical stability; the norm then has to
+            # be taken into account when calculating Δϵ
+            chi_states = [
+                chi / nrm for (chi, nrm) in zip(chi_states, chi_norms)
+            ]
+
+            # Backward propagation
+            if backend == 'jax':
+                χ_array, backward_states = _backward_propagation_jax(
+                    chi_states,
+                    adjoint_objectives,
+                    guess_pulses,
+                    pulses_mapping,
+                    dts,
+                )
+            else:
+                χ_array, backward_storage_arrays = None, None
+                if dense_storage:
+                    (
+                        χ_array,
+                        backward_storage_arrays,
+                    ) = _dense_storage_arrays(chi_states, len(tlist), dtype)
+                backward_states = parallel_map[1](
+                    _backward_propagation,
+                    list(range(len(objectives))),
+                    (
+                        chi_states,
+                        adjoint_objectives,
+                        guess_pulses,
+                        pulses_mapping,
+                        tlist,
+                        dts,
+                        propagators,
+                        storage,
+                        _OperatorCache(
+                            adjoint_objectives,
+                            guess_pulses,
+                            pulses_mapping,
+                            operator_groups,
+                        ),
+                        backward_storage_arrays,
+                    ),
+                )
+                χ_array = _dense_vectors(
+                    χ_array, backward_storage_arrays, backward_states
+                )
+
+            # μ = ∂H/∂ϵ for the standard equations of motion does not depend on
+            # the time or the states, so that we can evaluate it once, as
+            # matrices acting on the vectorized states
+            mu_stacks = None
+            if mu is derivative_wrt_pulse and overlap is _overlap:
+                mu_stacks = _mu_stacks(
+                    objectives, guess_pulses, pulses_mapping, dtype
+                )
+
+            # Forward propagation and pulse update
+            logger.info("Started forward propagation/pulse update")
+            if second_order:
+                initial_states = [obj.initial_state for obj in objectives]
+                forward_vectors = None
+                if dense_storage:
+                    forward_vectors, forward_states = _dense_storage_arrays(
+                        initial_states, len(tlist), dtype
+                    )
+                if forward_vectors is None:
+                    forward_states = [
+                        storage(len(tlist)) for _ in range(len(objectives))
+                    ]
+                for i_obj in range(len(objectives)):
+                    forward_states[i_obj][0] = initial_states[i_obj]
+            g_a_integrals[:] = 0.0
+            optimized_pulses = [pulse.copy() for pulse in guess_pulses]
+            sweep_kwargs = dict(
+                objectives=objectives,
+                guess_pulses=guess_pulses,
+                optimized_pulses=optimized_pulses,
+                pulses_mapping=pulses_mapping,
+                tlist=tlist,
+                dts=dts,
+                χ_array=χ_array,
+                chi_norms=chi_norms,
+                mu_stacks=mu_stacks,
+                sigma=sigma,
+                forward_states=forward_states,
+                Ψ0_array=Ψ0_array,
+                shape_arrays=shape_arrays,
+                lambda_vals=lambda_vals,
+                g_a_integrals=g_a_integrals,
+            )
+            if backend == 'jax':
+                (
+                    fw_states,
+                    forward_vectors,
+                    forward_states,
+                ) = _forward_propagation_and_update_jax(**sweep_kwargs)
+            elif parallel_map[2] == 'threads':
+                fw_states = _forward_propagation_and_update_threaded(
+                    propagators=propagators,
+                    backward_states=backward_states,
+                    mu=mu,
+                    overlap=overlap,
+                    forward_states0=forward_states0,
+                    executor=executor,
+                    operator_groups=operator_groups,
+                    dtype=dtype,
+                    **sweep_kwargs,
+                )
+            else:
+                fw_states = _forward_propagation_and_update(
+                    propagators=propagators,
+                    backward_states=backward_states,
+                    mu=mu,
+                    overlap=overlap,
+                    forward_states0=forward_states0,
+                    parallel_map=parallel_map[2],
+                    operator_groups=operator_groups,
+                    dtype=dtype,
+                    **sweep_kwargs,
+                )
+            if backend != 'jax':
+                forward_vectors = _dense_vectors(
+                    forward_vectors, forward_states, forward_states
+                )
+            logger.info("Finished forward propagation/pulse update")
+            fw_states_T = fw_states
+            tau_vals = _tau_vals(
+                objectives, fw_states_T, overlap, targets_stack
             )
-            forward_states0 = forward_states
 
-    else:  # optimization finished without `check_convergence` break
+            toc = time.time()
+
+            # Display information about iteration
+            if info_hook is not None:
+                info = info_hook(
+                    backward_states=backward_states,
+                    forward_states=forward_states,
+                    forward_states0=forward_states0,
+                    fw_states_T=fw_states_T,
+                    guess_pulses=guess_pulses,
+                    optimized_pulses=optimized_pulses,
+                    g_a_integrals=g_a_integrals,
+                    tau_vals=tau_vals,
+                    start_time=tic,
+                    stop_time=toc,
+                    info_vals=result.info_vals,
+                    shared_data={},
+                    iteration=krotov_iteration,
+                    **info_hook_static_args,
+                )
+            # Update optimization `result` with info from finished iteration
+            result.iters.append(krotov_iteration)
+            result.iter_seconds.append(int(toc - tic))
+            if info is not None:
+                result.info_vals.append(info)
+            if not np.all(tau_vals == None):  # noqa
+                result.tau_vals.append(tau_vals)
+            result.optimized_controls = optimized_pulses
+            # pulses (time intervals) will be converted to controls (time grid
+            # points) farther below in "Finalize"
+            if store_all_pulses:
+                # we need to make a copy, so that the conversion in "Finalize"
+                # doesn't affect `all_pulses` as well.
+                result.all_pulses.append(
+                    [pulse.copy() for pulse in optimized_pulses]
+                )
+            result.states = fw_states_T
+
+            logger.info("Finished Krotov iteration %d", krotov_iteration)
+
+            # Convergence check
+            msg = None
+            if check_convergence is not None:
+                msg = check_convergence(result)
+            if krotov_iteration >= info_hook_static_args['iter_stop']:
+                # modify_params_after_iter may change iter_stop!
+                iter_stop = info_hook_static_args['iter_stop']
+                result.message = "Reached %d iterations" % iter_stop
+                break
+            if bool(msg) is True:  # this is not an anti-pattern!
+                result.message = "Reached convergence"
+                if isinstance(msg, str):
+                    result.message += ": " + msg
+                break
+            else:
+                # prepare for next iteration
+                guess_pulses = optimized_pulses
 
-        result.message = "Reached %d iterations" % max(iter_start, iter_stop)
+            if second_order:
+                sigma.refresh(
+                    forward_states=forward_states,
+                    forward_states0=forward_states0,
+                    chi_states=chi_states,
+                    chi_norms=chi_norms,
+                    optimized_pulses=optimized_pulses,
+                    guess_pulses=guess_pulses,
+                    objectives=objectives,
+                    result=result,
+                )
+                forward_states0 = forward_states
+                Ψ0_array = forward_vectors
+
+        else:  # optimization finished without `check_convergence` break
+
+            result.message = "Reached %d iterations" % max(
+                iter_start, iter_stop
+            )
 
-    # Finalize
-    result.end_local_time = time.localtime()
-    for i, pulse in enumerate(optimized_pulses):
-        result.optimized_controls[i] = pulse_onto_tlist(pulse)
-    if thread_pool_limiter is not None:
-        logger.debug("Unsetting threadpoolctrl.threadpool_limits")
-        thread_pool_limiter.unregister()
+        # Finalize
+        result.end_local_time = time.localtime()
+        for i, pulse in enumerate(optimized_pulses):
+            result.optimized_controls[i] = pulse_onto_tlist(pulse)
+
+    finally:
+        if thread_pool_limiter is not None:
+            logger.debug("Unsetting threadpoolctrl.threadpool_limits")
+            thread_pool_limiter.unregister()
+        if executor is not None:
+            executor.shutdown()
     return result
 
 
@@ -606,12 +777,15 @@ def _shape_val_to_callable(val):
 def _enforce_shape_array_range(shape_array):
     """Enforce values ∈ [0, 1] in shape array, with some room for
     rounding errors that will be clipped away.
+
+    The `shape_array` may also be a 2D array containing the shapes for all
+    pulses, which are then validated at once.
     """
     assert not np.iscomplexobj(shape_array)  # `discretize` should catch this
-    # the rounding errors can be introduced by control_onto_interval, and
-    # result in values slightly below 0 or above 1. We allow a generous margin
-    # of ±0.01; if something nonsensical is passed as a shape, we can be pretty
-    # sure that it will deviate by a significantly larger error.
+    # rounding errors (e.g., from control_onto_interval) may result in values
+    # slightly below 0 or above 1. We allow a generous margin of ±0.01; if
+    # something nonsensical is passed as a shape, we can be pretty sure that
+    # it will deviate by a significantly larger error.
     if np.min(shape_array) < -0.01 or np.max(shape_array) > 1.01:
         raise ValueError(
             "Update shapes ('update_shape' in pulse options-dict) must have "
@@ -674,14 +848,17 @@ def _initialize_krotov_controls(objectives, pulse_options, tlist):
             "Each value in pulse_options must be a dict that contains "
             "the key 'lambda_a'."
         )
-    shape_arrays = []
-    for options in options_list:
+    # The update shapes are only needed on the intervals of the time grid, so
+    # we sample them there directly (instead of discretizing them onto the
+    # time grid and then converting them back with `control_onto_interval`)
+    t_samples = _sampling_midpoints(tlist)
+    shape_arrays = np.zeros((len(options_list), len(tlist) - 1))
+    for (i, options) in enumerate(options_list):
         try:
-            S = discretize(
+            shape_arrays[i, :] = discretize(
                 _shape_val_to_callable(options['update_shape']),
-                tlist,
+                t_samples,
                 args=(),
-                via_midpoints=True,
             )
         except KeyError:
             raise ValueError(
@@ -693,9 +870,8 @@ def _initialize_krotov_controls(objectives, pulse_options, tlist):
                 "Update shapes ('update_shape' in pulse options-dict) must be "
                 "real-valued: %s" % exc_info
             )
-        shape_arrays.append(
-            _enforce_shape_array_range(control_onto_interval(S))
-        )
+    if len(options_list) > 0:
+        shape_arrays = _enforce_shape_array_range(shape_arrays)
     return (
         guess_controls,
         guess_pulses,
@@ -804,18 +980,473 @@ def _skip_initial_forward_propagation(objectives, result, sigma, logger):
     return forward_states
 
 
+def _as_vector(state):
+    """Column-stacked data of the :class:`~qutip.Qobj` `state`, as a 1D
+    complex array.
+
+    For a density matrix, this is the vectorization that a super-operator acts
+    on (cf. :func:`qutip.superoperator.operator_to_vector`).
+    """
+    return state.full().ravel(order='F')
+
+
+class _DenseStateStorage:
+    """Storage for `N` propagated states in a contiguous complex array.
+
+    Every :class:`~qutip.Qobj` state is stored in vectorized form (cf.
+    :func:`_as_vector`) as a row of :attr:`vectors`, an array of shape
+    ``(N, dim)`` that is allocated when the first state is stored. Item access
+    returns a new :class:`~qutip.Qobj` with the same dims as the stored state.
+
+    Should a state that is not a :class:`~qutip.Qobj` (or that has a different
+    shape than the first state) be stored, the storage switches to holding the
+    states as-is, in an object array.
+    """
+
+    def __init__(self, N, dtype=np.complex128):
+        self.vectors = None
+        self._dtype = dtype
+        self._objects = None
+        self._N = N
+        self._shape = None
+        self._dims = None
+
+    @classmethod
+    def from_vectors(cls, vectors, state):
+        """Storage for the given `vectors`, an array of shape ``(N, dim)`` of
+        vectorized states that have the same shape and dims as `state`."""
+        storage = cls(len(vectors), dtype=vectors.dtype)
+        storage.vectors = vectors
+        storage._shape = state.shape
+        storage._dims = state.dims
+        return storage
+
+    def __len__(self):
+        return self._N
+
+    def __setitem__(self, index, state):
+        if self._objects is None and isinstance(state, Qobj):
+            if self.vectors is None:
+                self._shape = state.shape
+                self._dims = state.dims
+                self.vectors = np.empty(
+                    (self._N, self._shape[0] * self._shape[1]),
+                    dtype=self._dtype,
+                )
+            if state.shape == self._shape:
+                self.vectors[index] = _as_vector(state)
+                return
+        if self._objects is None:
+            objects = np.empty(self._N, dtype=object)
+            if self.vectors is not None:
+                for i in range(self._N):
+                    objects[i] = self[i]
+                self.vectors = None
+            self._objects = objects
+        self._objects[index] = state
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._N))]
+        if self._objects is not None:
+            return self._objects[index]
+        if self.vectors is None:
+            return None
+        return Qobj(
+            self.vectors[index].reshape(self._shape, order='F'),
+            dims=self._dims,
+        )
+
+    def __iter__(self):
+        for i in range(self._N):
+            yield self[i]
+
+
+def _dense_storage_arrays(states, N, dtype=np.complex128):
+    """Preallocated storage for `N` states of each objective.
+
+    Returns a tuple ``(vectors, storage_arrays)`` of an array `vectors` of
+    shape ``(n_obj, N, dim)`` and a list of :class:`_DenseStateStorage`, one
+    for each of the given `states` (e.g., the states at initial time), that
+    store the vectorized states in the rows of `vectors`. Returns
+    ``(None, None)`` unless all `states` are :class:`~qutip.Qobj` instances
+    of the same shape.
+    """
+    if not all(isinstance(state, Qobj) for state in states):
+        return None, None
+    shape = states[0].shape
+    if any(state.shape != shape for state in states):
+        return None, None
+    vectors = np.empty((len(states), N, shape[0] * shape[1]), dtype=dtype)
+    storage_arrays = [
+        _DenseStateStorage.from_vectors(vectors[k], state)
+        for (k, state) in enumerate(states)
+    ]
+    return vectors, storage_arrays
+
+
+def _dense_vectors(vectors, storage_arrays, states):
+    """Return the `vectors` from :func:`_dense_storage_arrays` if the
+    propagated `states` are the given `storage_arrays`, still storing their
+    states in the rows of `vectors`, or None otherwise.
+
+    The `states` are not the `storage_arrays` if, e.g., a `parallel_map` that
+    uses multiple processes returned copies of them. A storage array no longer
+    uses `vectors` if a state that is not a :class:`~qutip.Qobj` of the
+    expected shape was stored.
+    """
+    if vectors is None:
+        return None
+    if all(
+        (a is b) and (a.vectors is not None)
+        for (a, b) in zip(states, storage_arrays)
+    ):
+        return vectors
+    return None
+
+
+def _vectors_at(storage_arrays, vectors, time_index, dtype=np.complex128):
+    """Array of shape ``(n_obj, dim)`` of the vectorized states at
+    `time_index` in the given `storage_arrays`, one for each objective.
+
+    These are taken directly from `vectors` (cf. :func:`_dense_vectors`), if
+    given. Otherwise, the states are read from the `storage_arrays` and
+    vectorized (cf. :func:`_as_vector`) into an array of the given `dtype`.
+    """
+    if vectors is not None:
+        return vectors[:, time_index]
+    return np.array(
+        [_as_vector(states[time_index]) for states in storage_arrays],
+        dtype=dtype,
+    )
+
+
+def _stacked_targets(objectives):
+    """Stack the vectorized targets of all `objectives` (cf.
+    :func:`_as_vector`) into a single array of shape ``(n_obj, dim)``.
+
+    Returns None unless all targets are kets or density matrices of the same
+    shape.
+    """
+    targets = [obj.target for obj in objectives]
+    if not all(isinstance(target, Qobj) for target in targets):
+        return None
+    if targets[0].type not in ['ket', 'oper']:
+        return None
+    if any(
+        (target.type, target.shape) != (targets[0].type, targets[0].shape)
+        for target in targets
+    ):
+        return None
+    return np.stack([_as_vector(target) for target in targets])
+
+
+def _tau_vals(objectives, states_T, overlap, targets_stack=None):
+    """Overlaps of the `states_T` with the targets of the `objectives`.
+
+    If given, `targets_stack` must be the result of :func:`_stacked_targets`,
+    for `overlap` being the default :func:`.second_order._overlap`. In this
+    case, if the `states_T` match the targets in type and shape, all overlaps
+    are calculated at once.
+    """
+    if targets_stack is not None and all(
+        isinstance(state, Qobj)
+        and (state.type, state.shape) == (obj.target.type, obj.target.shape)
+        for (state, obj) in zip(states_T, objectives)
+    ):
+        states_stack = np.stack([_as_vector(state) for state in states_T])
+        return np.einsum('ki,ki->k', targets_stack.conj(), states_stack)
+    return np.array(
+        [
+            overlap(obj.target, state_T)
+            for (state_T, obj) in zip(states_T, objectives)
+        ]
+    )
+
+
+def _mu_operators(objectives, pulses, pulses_mapping):
+    """Evaluate :func:`.derivative_wrt_pulse` for every pulse and objective.
+
+    Returns:
+        tuple or None: A tuple ``(dim, mu_ops)``, where `dim` is the dimension
+        of the vectorized states, and ``mu_ops[l][k]`` is μ for the k'th
+        objective and the l'th pulse, as a :class:`~qutip.Qobj` of shape
+        ``(dim, dim)`` (or None if the pulse does not occur in the
+        objective). None if the objectives do not allow for this
+        representation (non-Qobj states, states of different shapes, or a
+        mismatch between the type of state and μ).
+    """
+    states = [obj.initial_state for obj in objectives]
+    if not all(isinstance(state, Qobj) for state in states):
+        return None
+    state_type = states[0].type
+    shape = states[0].shape
+    if state_type == 'ket':
+        mu_type = 'oper'
+    elif state_type == 'oper':
+        mu_type = 'super'
+    else:
+        return None
+    if any(
+        (state.type, state.shape) != (state_type, shape) for state in states
+    ):
+        return None
+    dim = shape[0] * shape[1]
+    mu_ops = []
+    for i_pulse in range(len(pulses)):
+        mu_ops.append([])
+        for i_obj in range(len(objectives)):
+            μ = derivative_wrt_pulse(
+                objectives, i_obj, pulses, pulses_mapping, i_pulse, 0
+            )
+            if isinstance(μ, Qobj):
+                if μ.type != mu_type or μ.shape != (dim, dim):
+                    return None
+                mu_ops[i_pulse].append(μ)
+            else:
+                # the pulse does not occur in the objective: μ = 0
+                mu_ops[i_pulse].append(None)
+    return dim, mu_ops
+
+
+def _mu_stacks(objectives, pulses, pulses_mapping, dtype=np.complex128):
+    """Evaluate :func:`.derivative_wrt_pulse` as matrices.
+
+    Returns:
+        numpy.ndarray or list or None: An array of shape ``(n_pulses, n_obj,
+        dim, dim)`` containing μ for every pulse and objective, so that
+        ``mu_stacks[l, k] @ _as_vector(Ψ)`` is the vectorization of μ(Ψ) for
+        the state Ψ of the k'th objective and the l'th pulse. If `dim` is
+        larger than :obj:`_DENSE_MU_MAX_DIM`, a nested list of sparse
+        matrices instead, with the same semantics for ``mu_stacks[l][k]``.
+        None if the objectives do not allow for this representation (cf.
+        :func:`_mu_operators`).
+
+    The dense array is in C (row-major) order: all update kernels contract
+    the last axis of `mu_stacks` with the state vectors, so that each row of
+    μ must be contiguous. Fortran order (column-major μ) makes the batched
+    products slower, not faster.
+    """
+    mu_operators = _mu_operators(objectives, pulses, pulses_mapping)
+    if mu_operators is None:
+        return None
+    dim, mu_ops = mu_operators
+    dense = dim <= _DENSE_MU_MAX_DIM
+    if dense:
+        mu_stacks = np.zeros(
+            (len(pulses), len(objectives), dim, dim), dtype=dtype
+        )
+    else:
+        mu_stacks = [
+            [
+                scipy.sparse.csr_matrix((dim, dim), dtype=dtype)
+                for _ in objectives
+            ]
+            for _ in pulses
+        ]
+    for (i_pulse, mu_ops_for_pulse) in enumerate(mu_ops):
+        for (i_obj, μ) in enumerate(mu_ops_for_pulse):
+            if μ is None:
+                continue  # μ = 0
+            if dense:
+                mu_stacks[i_pulse, i_obj] = μ.full()
+            else:
+                mu_stacks[i_pulse][i_obj] = μ.data.astype(dtype, copy=False)
+    return mu_stacks
+
+
+def _batched_update_einsum(
+    χ_vecs, mu_stacks, Ψ_vecs, chi_norms, Δϕ_vecs, σ, second_order
+):
+    """Sum of the contributions of all objectives to the pulse update.
+
+    Args:
+        χ_vecs (numpy.ndarray): vectorized backward-propagated states, shape
+            ``(n_obj, dim)``
+        mu_stacks (numpy.ndarray): μ for every pulse and objective, cf.
+            :func:`_mu_stacks`
+        Ψ_vecs (numpy.ndarray): vectorized forward-propagated states, shape
+            ``(n_obj, dim)``
+        chi_norms (numpy.ndarray): norms of the un-normalized χ states
+        Δϕ_vecs (numpy.ndarray): vectorized Δϕ for the second-order update.
+            Ignored if `second_order` is False.
+        σ (float): value of σ(t) for the second-order update. Ignored if
+            `second_order` is False.
+        second_order (bool): Whether to include the second-order term
+
+    Returns:
+        numpy.ndarray: For each pulse, the sum over the objectives of
+        ``chi_norm * ⟨χ|μ|Ψ⟩ + σ/2 * ⟨Δϕ|μ|Ψ⟩``, cf. :func:`_objective_update`.
+    """
+    # μ|Ψ⟩ for all pulses and objectives, shared by both terms of the update
+    μΨ = np.einsum('pkij,kj->pki', mu_stacks, Ψ_vecs)
+    updates = np.einsum('k,ki,pki->p', chi_norms, χ_vecs.conj(), μΨ)
+    if second_order:
+        updates += (0.5 * σ) * np.einsum('ki,pki->p', Δϕ_vecs.conj(), μΨ)
+    return updates
+
+
+def _batched_update_loops(
+    χ_vecs, mu_stacks, Ψ_vecs, chi_norms, Δϕ_vecs, σ, second_order
+):
+    """Explicit-loop implementation of :func:`_batched_update_einsum`.
+
+    This is too slow to be useful in pure Python, but is compiled with
+    :mod:`numba` if available.
+    """
+    n_pulses, n_obj, dim, _ = mu_stacks.shape
+    updates = np.zeros(n_pulses, dtype=np.complex128)
+    for i_pulse in range(n_pulses):
+        for k in range(n_obj):
+            χμΨ = 0j
+            ΔϕμΨ = 0j
+            for i in range(dim):
+                μΨ_i = 0j
+                for j in range(dim):
+                    μΨ_i += mu_stacks[i_pulse, k, i, j] * Ψ_vecs[k, j]
+                χμΨ += χ_vecs[k, i].conjugate() * μΨ_i
+                if second_order:
+                    ΔϕμΨ += Δϕ_vecs[k, i].conjugate() * μΨ_i
+            updates[i_pulse] += chi_norms[k] * χμΨ
+            if second_order:
+                updates[i_pulse] += 0.5 * σ * ΔϕμΨ
+    return updates
+
+
+if _HAS_NUMBA:
+    # compiled on first use; with cache=True, the compiled function is written
+    # to disk, so that later processes do not have to compile it again
+    _batched_update = numba.njit(fastmath=True, cache=True)(
+        _batched_update_loops
+    )
+else:
+    _batched_update = _batched_update_einsum
+
+
+def _batched_update_sparse(
+    χ_vecs, mu_stacks, Ψ_vecs, chi_norms, Δϕ_vecs, σ, second_order
+):
+    """Equivalent of :func:`_batched_update_einsum` for `mu_stacks` that are
+    nested lists of sparse matrices"""
+    updates = np.zeros(len(mu_stacks), dtype=np.complex128)
+    for (i_pulse, μ_stack) in enumerate(mu_stacks):
+        for (k, μ) in enumerate(μ_stack):
+            if μ.nnz == 0:
+                continue  # the pulse does not occur in the objective
+            μΨ = μ @ Ψ_vecs[k]
+            updates[i_pulse] += chi_norms[k] * np.vdot(χ_vecs[k], μΨ)
+            if second_order:
+                updates[i_pulse] += 0.5 * σ * np.vdot(Δϕ_vecs[k], μΨ)
+    return updates
+
+
+def _plug_in(obj, pulses, mapping, time_index):
+    """Return `obj.H` and `obj.c_ops` with the values of `pulses` at
+    `time_index` plugged in, cf. :func:`.plug_in_pulse_values`.
+    """
+    H = plug_in_pulse_values(obj.H, pulses, mapping[0], time_index)
+    c_ops = [
+        plug_in_pulse_values(c_op, pulses, mapping[ic + 1], time_index)
+        for (ic, c_op) in enumerate(obj.c_ops)
+    ]
+    return H, c_ops
+
+
+def _operator_groups(objectives):
+    """Group objectives that share the same `H` and `c_ops`.
+
+    Returns:
+        list[int] or None: For each objective, the index of the first
+        objective with identical (by `id`) `H` and `c_ops`, or None if no two
+        objectives share their operators.
+    """
+    first = {}
+    groups = []
+    for (i_obj, obj) in enumerate(objectives):
+        key = (id(obj.H), tuple(id(c_op) for c_op in obj.c_ops))
+        groups.append(first.setdefault(key, i_obj))
+    if len(first) == len(objectives):
+        return None
+    return groups
+
+
+def _plugged_in_operators(
+    objectives, pulses, pulses_mapping, time_index, groups
+):
+    """Return, for every objective, the tuple ``(H, c_ops)`` from
+    :func:`_plug_in`, evaluated only once for each of the `groups` (cf.
+    :func:`_operator_groups`)"""
+    operators = {}
+    for i_obj in set(groups):
+        operators[i_obj] = _plug_in(
+            objectives[i_obj], pulses, pulses_mapping[i_obj], time_index
+        )
+    return [operators[i_obj] for i_obj in groups]
+
+
+class _OperatorCache:
+    """Lazily evaluated operators for propagating over the entire time grid.
+
+    Calling the cache with ``(i_obj, time_index)`` returns the tuple ``(H,
+    c_ops)`` from :func:`_plug_in` for the objective with index `i_obj`. The
+    result is evaluated only once for each of the `groups` (cf.
+    :func:`_operator_groups`) of objectives. If `groups` is None, there is no
+    caching.
+    """
+
+    def __init__(self, objectives, pulses, pulses_mapping, groups):
+        self._objectives = objectives
+        self._pulses = pulses
+        self._pulses_mapping = pulses_mapping
+        self._groups = groups
+        self._cache = {}
+
+    def __call__(self, i_obj, time_index):
+        if self._groups is None:
+            return _plug_in(
+                self._objectives[i_obj],
+                self._pulses,
+                self._pulses_mapping[i_obj],
+                time_index,
+            )
+        i_first = self._groups[i_obj]
+        key = (i_first, time_index)
+        try:
+            return self._cache[key]
+        except KeyError:
+            operators = _plug_in(
+                self._objectives[i_first],
+                self._pulses,
+                self._pulses_mapping[i_first],
+                time_index,
+            )
+            self._cache[key] = operators
+            return operators
+
+
 def _forward_propagation(
     i_objective,
     objectives,
     pulses,
     pulses_mapping,
     tlist,
+    dts,
     propagators,
     storage,
     store_all=True,
+    operators=None,
+    storage_arrays=None,
 ):
     """Forward propagation of the initial state of a single objective over the
-    entire `tlist`"""
+    entire `tlist`, with `dts` the array of time steps in `tlist`
+
+    If given, `operators` must be an :class:`_OperatorCache` for `objectives`
+    and `pulses`. If given, the states are stored in
+    ``storage_arrays[i_objective]`` instead of a new ``storage(len(tlist))``.
+
+    Returns the storage array and the propagated state at final time if
+    `store_all` is True, or only the propagated state otherwise.
+    """
     logger = logging.getLogger('krotov')
     logger.info(
         "Started initial forward propagation of objective %d", i_objective
@@ -823,18 +1454,19 @@ def _forward_propagation(
     obj = objectives[i_objective]
     state = obj.initial_state
     if store_all:
-        storage_array = storage(len(tlist))
+        if storage_arrays is None:
+            storage_array = storage(len(tlist))
+        else:
+            storage_array = storage_arrays[i_objective]
         storage_array[0] = state
     mapping = pulses_mapping[i_objective]
     for time_index in range(len(tlist) - 1):  # index over intervals
-        H = plug_in_pulse_values(obj.H, pulses, mapping[0], time_index)
-        c_ops = [
-            plug_in_pulse_values(c_op, pulses, mapping[ic + 1], time_index)
-            for (ic, c_op) in enumerate(obj.c_ops)
-        ]
-        dt = tlist[time_index + 1] - tlist[time_index]
+        if operators is None:
+            H, c_ops = _plug_in(obj, pulses, mapping, time_index)
+        else:
+            H, c_ops = operators(i_objective, time_index)
         state = propagators[i_objective](
-            H, state, dt, c_ops, initialize=(time_index == 0)
+            H, state, dts[time_index], c_ops, initialize=(time_index == 0)
         )
         if store_all:
             storage_array[time_index + 1] = state
@@ -842,7 +1474,7 @@ def _forward_propagation(
         "Finished initial forward propagation of objective %d", i_objective
     )
     if store_all:
-        return storage_array
+        return storage_array, state
     else:
         return state
 
@@ -854,30 +1486,43 @@ def _backward_propagation(
     pulses,
     pulses_mapping,
     tlist,
+    dts,
     propagators,
     storage,
+    operators=None,
+    storage_arrays=None,
 ):
-    """Backward propagation of chi_states[i_state] over the entire `tlist`"""
+    """Backward propagation of chi_states[i_state] over the entire `tlist`,
+    with `dts` the array of time steps in `tlist`
+
+    The backward propagation is under the adjoint Hamiltonian, with complex
+    conjugate pulse values. As the `pulses` are real-valued (enforced by
+    :func:`optimize_pulses`), their values are plugged into the
+    `adjoint_objectives` directly.
+
+    If given, `operators` must be an :class:`_OperatorCache` for
+    `adjoint_objectives` and `pulses`. If given, the states are stored in
+    ``storage_arrays[i_state]`` instead of a new ``storage(len(tlist))``.
+    """
     logger = logging.getLogger('krotov')
     logger.info("Started backward propagation of state %d", i_state)
     state = chi_states[i_state]
     obj = adjoint_objectives[i_state]
-    storage_array = storage(len(tlist))
+    if storage_arrays is None:
+        storage_array = storage(len(tlist))
+    else:
+        storage_array = storage_arrays[i_state]
     storage_array[-1] = state
     mapping = pulses_mapping[i_state]
     for time_index in range(len(tlist) - 2, -1, -1):  # index bw over intervals
-        H = plug_in_pulse_values(
-            obj.H, pulses, mapping[0], time_index, conjugate=True
-        )
-        c_ops = [
-            plug_in_pulse_values(c_op, pulses, mapping[ic + 1], time_index)
-            for (ic, c_op) in enumerate(obj.c_ops)
-        ]
-        dt = tlist[time_index + 1] - tlist[time_index]
+        if operators is None:
+            H, c_ops = _plug_in(obj, pulses, mapping, time_index)
+        else:
+            H, c_ops = operators(i_state, time_index)
         state = propagators[i_state](
             H,
             state,
-            dt,
+            dts[time_index],
             c_ops,
             backwards=True,
             initialize=(time_index == len(tlist) - 2),
@@ -887,6 +1532,703 @@ def _backward_propagation(
     return storage_array
 
 
+def _objective_update(
+    i_obj,
+    time_index,
+    χ,
+    Ψ,
+    Δϕ,
+    σ,
+    chi_norm,
+    objectives,
+    pulses,
+    pulses_mapping,
+    mu,
+    overlap,
+    mu_stacks=None,
+):
+    """Contribution of a single objective to the pulse update.
+
+    Returns:
+        numpy.ndarray: For each pulse, the complex value
+        ``chi_norm * ⟨χ|μ|Ψ⟩ + σ/2 * ⟨Δϕ|μ|Ψ⟩``, where the second-order term is
+        only included if `Δϕ` is not None.
+
+    If `mu_stacks` is given (cf. :func:`_mu_stacks`), `χ`, `Ψ`, and `Δϕ` must
+    be vectorized states (cf. :func:`_as_vector`) and μ is taken from
+    `mu_stacks` instead of calling `mu`.
+    """
+    update = np.zeros(len(pulses), dtype=np.complex128)
+    if mu_stacks is not None:
+        for (i_pulse, μ_stack) in enumerate(mu_stacks):
+            μΨ = μ_stack[i_obj] @ Ψ
+            update[i_pulse] = chi_norm * np.vdot(χ, μΨ)
+            if Δϕ is not None:
+                update[i_pulse] += 0.5 * σ * np.vdot(Δϕ, μΨ)
+        return update
+    for i_pulse in range(len(pulses)):
+        μ = mu(objectives, i_obj, pulses, pulses_mapping, i_pulse, time_index)
+        μΨ = μ(Ψ)
+        update[i_pulse] = overlap(χ, μΨ) * chi_norm  # ⟨χ|μ|Ψ⟩ ∈ ℂ
+        if Δϕ is not None:
+            update[i_pulse] += 0.5 * σ * overlap(Δϕ, μΨ)
+    return update
+
+
+def _update_pulses(
+    updates,
+    time_index,
+    dt,
+    optimized_pulses,
+    shape_arrays,
+    lambda_vals,
+    g_a_integrals,
+):
+    """Update the value of all `optimized_pulses` in the interval
+    `time_index`, given the `updates` summed over all objectives (cf.
+    :func:`_objective_update`)"""
+    for (i_pulse, update) in enumerate(updates):
+        λₐ = lambda_vals[i_pulse]
+        S_t = shape_arrays[i_pulse][time_index]
+        Δϵ = (S_t / λₐ) * update.imag  # ∈ ℝ
+        g_a_integrals[i_pulse] += abs(Δϵ) ** 2 * dt  # dt may vary!
+        optimized_pulses[i_pulse][time_index] += Δϵ
+
+
+def _forward_propagation_and_update(
+    *,
+    objectives,
+    guess_pulses,
+    optimized_pulses,
+    pulses_mapping,
+    tlist,
+    dts,
+    propagators,
+    backward_states,
+    χ_array,
+    chi_norms,
+    mu,
+    mu_stacks,
+    overlap,
+    sigma,
+    forward_states,
+    forward_states0,
+    Ψ0_array,
+    shape_arrays,
+    lambda_vals,
+    g_a_integrals,
+    parallel_map,
+    operator_groups=None,
+    dtype=np.complex128,
+):
+    """Forward propagation and pulse update, interval by interval.
+
+    In each time interval, the pulse update is summed over all objectives
+    (:func:`_batched_update` if `mu_stacks` is given, or
+    :func:`_objective_update` otherwise), the `optimized_pulses` are updated
+    (:func:`_update_pulses`), and then all objectives are propagated over the
+    interval under the updated pulses, using `parallel_map`
+    (:func:`_forward_propagation_step`). For a second-order update, the
+    propagated states are stored in `forward_states`.
+
+    If `mu_stacks` is given (cf. :func:`_mu_stacks`), the update uses the
+    vectorized `backward_states` and `forward_states0`, which are taken from
+    `χ_array` and `Ψ0_array` if these are not None (cf.
+    :func:`_vectors_at`). The vectorized states have the given `dtype`.
+
+    Returns:
+        list: the forward-propagated states at final time, for each objective.
+    """
+    second_order = sigma is not None
+    chi_norms_array = np.array(chi_norms)
+    fw_states = [obj.initial_state for obj in objectives]
+    if mu_stacks is not None:
+        Ψ_vecs = np.array([_as_vector(Ψ) for Ψ in fw_states], dtype=dtype)
+    if second_order:
+        # In the update for the pulses in the first time interval, we use
+        # the states at t=0. Hence, Δϕ(t=0) = 0
+        if mu_stacks is not None:
+            Δϕ_vecs = np.zeros_like(Ψ_vecs)
+        else:
+            delta_phis = [
+                Qobj(np.zeros(shape=Ψ.shape), dims=Ψ.dims) for Ψ in fw_states
+            ]
+    for time_index in range(len(tlist) - 1):  # iterate over time intervals
+        dt = dts[time_index]
+        if second_order:
+            σ = sigma(tlist[time_index] + 0.5 * dt)
+        if mu_stacks is not None:
+            χ_vecs = _vectors_at(backward_states, χ_array, time_index, dtype)
+        # pulse update
+        updates = np.zeros(len(guess_pulses), dtype=np.complex128)
+        if mu_stacks is not None:
+            # ⟨χ|μ|Ψ⟩ ∈ ℂ, for all objectives at once
+            if not second_order:
+                # placeholders, to keep the argument types of the
+                # (possibly compiled) kernel fixed
+                Δϕ_vecs, σ = Ψ_vecs, 0.0
+            if isinstance(mu_stacks, np.ndarray):
+                batched_update = _batched_update
+            else:
+                batched_update = _batched_update_sparse
+            updates = batched_update(
+                χ_vecs,
+                mu_stacks,
+                Ψ_vecs,
+                chi_norms_array,
+                Δϕ_vecs,
+                σ,
+                second_order,
+            )
+        else:
+            for i_obj in range(len(objectives)):
+                updates += _objective_update(
+                    i_obj,
+                    time_index,
+                    backward_states[i_obj][time_index],
+                    fw_states[i_obj],
+                    delta_phis[i_obj] if second_order else None,
+                    σ if second_order else None,
+                    chi_norms[i_obj],
+                    objectives,
+                    guess_pulses,
+                    pulses_mapping,
+                    mu,
+                    overlap,
+                )
+        _update_pulses(
+            updates,
+            time_index,
+            dt,
+            optimized_pulses,
+            shape_arrays,
+            lambda_vals,
+            g_a_integrals,
+        )
+        # forward propagation
+        operators = None
+        if operator_groups is not None:
+            operators = _plugged_in_operators(
+                objectives,
+                optimized_pulses,
+                pulses_mapping,
+                time_index,
+                operator_groups,
+            )
+        fw_states = parallel_map(
+            _forward_propagation_step,
+            list(range(len(objectives))),
+            (
+                fw_states,
+                objectives,
+                optimized_pulses,
+                pulses_mapping,
+                tlist,
+                time_index,
+                propagators,
+                operators,
+                dts,
+            ),
+        )
+        if mu_stacks is not None:
+            Ψ_vecs = np.array([_as_vector(Ψ) for Ψ in fw_states], dtype=dtype)
+        if second_order:
+            # Δϕ(t + dt), to be used for the update in the next interval
+            if mu_stacks is not None:
+                Ψ0_vecs = _vectors_at(
+                    forward_states0, Ψ0_array, time_index + 1, dtype
+                )
+                np.subtract(Ψ_vecs, Ψ0_vecs, out=Δϕ_vecs)
+            else:
+                delta_phis = [
+                    fw_states[k] - forward_states0[k][time_index + 1]
+                    for k in range(len(objectives))
+                ]
+            # storage
+            for i_obj in range(len(objectives)):
+                forward_states[i_obj][time_index + 1] = fw_states[i_obj]
+    return fw_states
+
+
+def _forward_propagation_and_update_threaded(
+    *,
+    objectives,
+    guess_pulses,
+    optimized_pulses,
+    pulses_mapping,
+    tlist,
+    dts,
+    propagators,
+    backward_states,
+    χ_array,
+    chi_norms,
+    mu,
+    mu_stacks,
+    overlap,
+    sigma,
+    forward_states,
+    forward_states0,
+    Ψ0_array,
+    shape_arrays,
+    lambda_vals,
+    g_a_integrals,
+    executor,
+    operator_groups=None,
+    dtype=np.complex128,
+):
+    """Forward propagation and pulse update, with one thread per objective.
+
+    Each thread calculates the contribution of its objective to the pulse
+    update in a time interval (:func:`_objective_update`), and then waits for
+    all other threads at a :class:`threading.Barrier`. Once all contributions
+    are available, the pulses are updated (:func:`_update_pulses`), and each
+    thread propagates its state over the time interval under the updated
+    pulses.
+
+    If `mu_stacks` is given (cf. :func:`_mu_stacks`), the update uses the
+    vectorized `backward_states` and `forward_states0`, which are taken from
+    `χ_array` and `Ψ0_array` if these are not None. The threads are taken
+    from the given `executor`, which must allow for at least one worker per
+    objective.
+    If `operator_groups` is given (cf. :func:`_operator_groups`), the
+    operators for each time step are evaluated only once for every group of
+    objectives. The vectorized states have the given `dtype`.
+
+    Returns:
+        list: the forward-propagated states at final time, for each objective.
+    """
+    n_obj = len(objectives)
+    nt = len(tlist)
+    second_order = sigma is not None
+    if second_order:
+        σ_vals = [sigma(tlist[i] + 0.5 * dts[i]) for i in range(nt - 1)]
+    obj_updates = np.zeros((n_obj, len(guess_pulses)), dtype=np.complex128)
+    time_index = [0]  # mutable, so that it can be advanced by the barrier
+    operators = [None]  # result of _plugged_in_operators for time_index - 1
+    fw_states = [obj.initial_state for obj in objectives]
+    errors = []
+
+    def update_pulses():
+        # executed by exactly one of the threads, after all threads have
+        # reached the barrier
+        _update_pulses(
+            obj_updates.sum(axis=0),
+            time_index[0],
+            dts[time_index[0]],
+            optimized_pulses,
+            shape_arrays,
+            lambda_vals,
+            g_a_integrals,
+        )
+        if operator_groups is not None:
+            operators[0] = _plugged_in_operators(
+                objectives,
+                optimized_pulses,
+                pulses_mapping,
+                time_index[0],
+                operator_groups,
+            )
+        time_index[0] += 1
+
+    barrier = threading.Barrier(n_obj, action=update_pulses)
+
+    def propagate(i_obj):
+        Ψ = fw_states[i_obj]
+        if mu_stacks is not None:
+            Ψ = _as_vector(Ψ).astype(dtype, copy=False)
+        Δϕ = None
+        if second_order:
+            Δϕ = 0 * Ψ
+        try:
+            for i in range(nt - 1):
+                if mu_stacks is None:
+                    χ = backward_states[i_obj][i]
+                elif χ_array is not None:
+                    χ = χ_array[i_obj, i]
+                else:
+                    χ = backward_states[i_obj][i]
+                    χ = _as_vector(χ).astype(dtype, copy=False)
+                obj_updates[i_obj, :] = _objective_update(
+                    i_obj,
+                    i,
+                    χ,
+                    Ψ,
+                    Δϕ,
+                    σ_vals[i] if second_order else None,
+                    chi_norms[i_obj],
+                    objectives,
+                    guess_pulses,
+                    pulses_mapping,
+                    mu,
+                    overlap,
+                    mu_stacks,
+                )
+                barrier.wait()
+                fw_states[i_obj] = _forward_propagation_step(
+                    i_obj,
+                    fw_states,
+                    objectives,
+                    optimized_pulses,
+                    pulses_mapping,
+                    tlist,
+                    i,
+                    propagators,
+                    operators[0],
+                    dts,
+                )
+                Ψ = fw_states[i_obj]
+                if mu_stacks is not None:
+                    Ψ = _as_vector(Ψ).astype(dtype, copy=False)
+                if second_order:
+                    if mu_stacks is None:
+                        Δϕ = Ψ - forward_states0[i_obj][i + 1]
+                    elif Ψ0_array is not None:
+                        np.subtract(Ψ, Ψ0_array[i_obj, i + 1], out=Δϕ)
+                    else:
+                        Ψ0 = forward_states0[i_obj][i + 1]
+                        np.subtract(Ψ, _as_vector(Ψ0), out=Δϕ)
+                    forward_states[i_obj][i + 1] = fw_states[i_obj]
+        except threading.BrokenBarrierError:
+            pass  # another thread failed
+        except Exception as exc_info:
+            errors.append(exc_info)
+            barrier.abort()
+
+    futures = [executor.submit(propagate, i_obj) for i_obj in range(n_obj)]
+    for future in futures:
+        future.result()
+    if len(errors) > 0:
+        raise errors[0]
+    return fw_states
+
+
+def _check_jax_backend(
+    objectives,
+    pulses,
+    pulses_mapping,
+    propagators,
+    storage,
+    mu,
+    overlap,
+    dtype,
+):
+    """Raise an exception if the optimization cannot use ``backend='jax'``."""
+    try:
+        import jax  # noqa: F401
+    except ImportError:
+        raise ImportError("The jax library is not installed.")
+    if np.dtype(dtype) != np.complex128:
+        raise ValueError("backend='jax' requires dtype=complex128")
+    if not all(propagator is expm for propagator in propagators):
+        raise ValueError("backend='jax' requires propagator=expm")
+    if storage is not _DenseStateStorage:
+        raise ValueError("backend='jax' requires storage='array'")
+    if mu is not derivative_wrt_pulse or overlap is not _overlap:
+        raise ValueError("backend='jax' requires the default mu and overlap")
+    if any(len(obj.c_ops) > 0 for obj in objectives):
+        raise ValueError("backend='jax' does not support c_ops")
+    if _mu_operators(objectives, pulses, pulses_mapping) is None:
+        raise ValueError(
+            "backend='jax' requires all states to be Qobj kets or density "
+            "matrices of the same shape"
+        )
+    try:
+        for (k, obj) in enumerate(objectives):
+            _generator_parts(obj.H, pulses_mapping[k][0])
+    except ValueError:
+        raise ValueError(
+            "backend='jax' requires that all time-dependencies in H are "
+            "controls"
+        )
+
+
+def _generator_parts(H, pulse_indices):
+    """Operators in the Hamiltonian or Liouvillian `H` (in the nested-list
+    format), given the `pulse_indices` in the first element of the pulses
+    mapping of the objective.
+
+    Returns:
+        list: tuples ``(l, op)``, where `l` is the index of the pulse that
+        multiplies the operator `op`, or None for a time-independent `op`.
+
+    Raises:
+        ValueError: if `H` has a time-dependency that is not a pulse
+    """
+    H = H if isinstance(H, list) else [H]
+    pulse_of_part = {}
+    for (l, indices) in enumerate(pulse_indices):
+        for i in indices:
+            pulse_of_part[i] = l
+    parts = []
+    for (i, part) in enumerate(H):
+        op = part[0] if isinstance(part, list) else part
+        if i in pulse_of_part:
+            parts.append((pulse_of_part[i], op))
+        elif isinstance(part, list):
+            raise ValueError("Time-dependency in H that is not a pulse")
+        else:
+            parts.append((None, op))
+    return parts
+
+
+def _dense_generators(objectives, pulses_mapping, n_pulses, backwards=False):
+    """Dense matrices for the generator of the dynamics of all objectives.
+
+    Returns:
+        numpy.ndarray: Array `G` of shape ``(n_obj, 1 + n_pulses, dim,
+        dim)``, such that the generator of the k'th objective (the matrix that
+        :func:`.propagators.expm` exponentiates, after multiplying it by the
+        time step) for the pulse values ``u[l]`` is ``G[k, 0] + Σₗ u[l] G[k,
+        1 + l]``.
+    """
+    generators = None
+    for (k, obj) in enumerate(objectives):
+        parts = _generator_parts(obj.H, pulses_mapping[k][0])
+        op0 = parts[0][1]
+        eqm_factor = 1 if op0.type == 'super' else -1j
+        if backwards:
+            eqm_factor = eqm_factor.conjugate()
+        if generators is None:
+            generators = np.zeros(
+                (len(objectives), 1 + n_pulses) + op0.shape,
+                dtype=np.complex128,
+            )
+        for (l, op) in parts:
+            if l is None:
+                generators[k, 0] += eqm_factor * op.full()
+            else:
+                generators[k, 1 + l] += eqm_factor * op.full()
+    return generators
+
+
+def _propagate_step_jax(generators, pulse_vals, dt, state):
+    """Propagate the vectorized `state` of a single objective over the time
+    step `dt`, for a slice of the `generators` from
+    :func:`_dense_generators`."""
+    import jax.numpy as jnp
+    import jax.scipy.linalg
+
+    G = generators[0] + jnp.tensordot(pulse_vals, generators[1:], axes=1)
+    return jax.scipy.linalg.expm(G * dt) @ state
+
+
+def _propagate_steps_jax(generators, pulse_vals, dt, states):
+    """:func:`_propagate_step_jax` for all objectives at once."""
+    import jax
+
+    return jax.vmap(_propagate_step_jax, in_axes=(0, None, None, 0))(
+        generators, pulse_vals, dt, states
+    )
+
+
+def _backward_sweep_jax(generators, pulses, dts, χ_T):
+    """Backward-propagate the vectorized states `χ_T` (one row for each
+    objective) over the entire time grid, returning an array of shape
+    ``(n_obj, n_t, dim)``."""
+    import jax
+    import jax.numpy as jnp
+
+    def step(χ, xs):
+        (pulse_vals, dt) = xs
+        χ = _propagate_steps_jax(generators, pulse_vals, dt, χ)
+        return χ, χ
+
+    # `reverse` runs over the time intervals from last to first, but stores
+    # the propagated state for interval i (at time tlist[i]) in χs[i]
+    _, χs = jax.lax.scan(step, χ_T, (pulses.T, dts), reverse=True)
+    return jnp.concatenate([χs, χ_T[None]]).transpose(1, 0, 2)
+
+
+def _forward_sweep_jax(
+    generators,
+    mu_stacks,
+    χ_array,
+    chi_norms,
+    guess_pulses,
+    shape_arrays,
+    lambda_vals,
+    dts,
+    Ψ_0,
+    sigma_vals,
+    Ψ0_array,
+    second_order,
+):
+    """Forward-propagate the vectorized states `Ψ_0` (one row for each
+    objective) while updating the pulses, cf. :func:`_update_pulses`.
+
+    Returns:
+        tuple: The optimized pulses (shape ``(n_pulses, n_t - 1)``), the
+        ∫gₐ(t)dt for every pulse, the forward-propagated states at final
+        time (shape ``(n_obj, dim)``), and the forward-propagated states at
+        all times (shape ``(n_obj, n_t, dim)``, or None if not
+        `second_order`).
+    """
+    import jax
+    import jax.numpy as jnp
+
+    def step(carry, xs):
+        (Ψ, Δϕ, g_a_integrals) = carry
+        (χ, guess_vals, S_t, dt, σ, Ψ0_next) = xs
+        μΨ = jnp.einsum('pkij,kj->pki', mu_stacks, Ψ)
+        update = jnp.einsum('k,ki,pki->p', chi_norms, χ.conj(), μΨ)
+        if second_order:
+            update += (0.5 * σ) * jnp.einsum('ki,pki->p', Δϕ.conj(), μΨ)
+        Δϵ = (S_t / lambda_vals) * update.imag
+        g_a_integrals = g_a_integrals + jnp.abs(Δϵ) ** 2 * dt
+        pulse_vals = guess_vals + Δϵ
+        Ψ = _propagate_steps_jax(generators, pulse_vals, dt, Ψ)
+        if second_order:
+            Δϕ = Ψ - Ψ0_next
+            return (Ψ, Δϕ, g_a_integrals), (pulse_vals, Ψ)
+        return (Ψ, Δϕ, g_a_integrals), (pulse_vals, None)
+
+    xs = (
+        χ_array.transpose(1, 0, 2)[:-1],  # χ(tᵢ) for every interval i
+        guess_pulses.T,
+        shape_arrays.T,
+        dts,
+        sigma_vals,
+        None if Ψ0_array is None else Ψ0_array.transpose(1, 0, 2)[1:],
+    )
+    carry = (Ψ_0, jnp.zeros_like(Ψ_0), jnp.zeros(len(lambda_vals)))
+    (Ψ_T, _, g_a_integrals), (pulses, Ψs) = jax.lax.scan(step, carry, xs)
+    forward_vecs = None
+    if second_order:
+        forward_vecs = jnp.concatenate([Ψ_0[None], Ψs]).transpose(1, 0, 2)
+    return pulses.T, g_a_integrals, Ψ_T, forward_vecs
+
+
+_JAX_SWEEPS = None
+
+
+def _jax_sweeps():
+    """Compiled versions of :func:`_backward_sweep_jax` and
+    :func:`_forward_sweep_jax`.
+
+    The :mod:`jax` library is imported only here (and in the functions that
+    are compiled), so that importing :mod:`krotov` does not import :mod:`jax`
+    unless ``backend='jax'`` is used. The jitted functions are created once
+    and compile on their first call, re-using the compiled function for
+    subsequent calls with arguments of the same shapes and dtypes.
+    """
+    global _JAX_SWEEPS
+    if _JAX_SWEEPS is None:
+        import jax
+
+        _JAX_SWEEPS = (
+            jax.jit(_backward_sweep_jax),
+            jax.jit(_forward_sweep_jax, static_argnames=['second_order']),
+        )
+    return _JAX_SWEEPS
+
+
+def _backward_propagation_jax(
+    chi_states, adjoint_objectives, pulses, pulses_mapping, dts
+):
+    """Equivalent to :func:`_backward_propagation` with the
+    :func:`.propagators.expm` propagator, for all objectives at once.
+
+    Returns the array of the vectorized backward-propagated states, of shape
+    ``(n_obj, n_t, dim)``, and the list of storage arrays that use its rows
+    (cf. :func:`_dense_storage_arrays`).
+    """
+    generators = _dense_generators(
+        adjoint_objectives, pulses_mapping, len(pulses), backwards=True
+    )
+    from jax.experimental import enable_x64
+
+    backward_sweep, _ = _jax_sweeps()
+    χ_T = np.stack([_as_vector(χ) for χ in chi_states])
+    with enable_x64():
+        χ_array = np.asarray(
+            backward_sweep(generators, np.array(pulses), dts, χ_T)
+        )
+    return χ_array, [
+        _DenseStateStorage.from_vectors(χ_array[k], chi_states[k])
+        for k in range(len(chi_states))
+    ]
+
+
+def _forward_propagation_and_update_jax(
+    *,
+    objectives,
+    guess_pulses,
+    optimized_pulses,
+    pulses_mapping,
+    tlist,
+    dts,
+    χ_array,
+    chi_norms,
+    mu_stacks,
+    sigma,
+    forward_states,
+    Ψ0_array,
+    shape_arrays,
+    lambda_vals,
+    g_a_integrals,
+):
+    """Equivalent to :func:`_forward_propagation_and_update` with the
+    :func:`.propagators.expm` propagator.
+
+    Writes the `optimized_pulses` and `g_a_integrals` in-place.
+    Returns the list of forward-propagated states at final time, the array of
+    the vectorized forward-propagated states, and the new `forward_states`
+    that use its rows (only if `sigma` is given; otherwise, None and the
+    unchanged `forward_states`).
+    """
+    second_order = sigma is not None
+    generators = _dense_generators(
+        objectives, pulses_mapping, len(guess_pulses)
+    )
+    if not isinstance(mu_stacks, np.ndarray):  # sparse, for large dim
+        mu_stacks = np.array(
+            [[μ.toarray() for μ in mu_stack] for mu_stack in mu_stacks]
+        )
+    sigma_vals = np.zeros(len(dts))
+    if second_order:
+        sigma_vals = np.array(
+            [sigma(t + 0.5 * dt) for (t, dt) in zip(tlist[:-1], dts)]
+        )
+    from jax.experimental import enable_x64
+
+    _, forward_sweep = _jax_sweeps()
+    Ψ_0 = np.stack([_as_vector(obj.initial_state) for obj in objectives])
+    with enable_x64():
+        (pulses, g_a_vals, Ψ_T, forward_vecs) = forward_sweep(
+            generators,
+            mu_stacks,
+            χ_array,
+            np.array(chi_norms),
+            np.array(guess_pulses),
+            np.array(shape_arrays),
+            np.array(lambda_vals),
+            dts,
+            Ψ_0,
+            sigma_vals,
+            Ψ0_array,
+            second_order=second_order,
+        )
+        pulses = np.asarray(pulses)
+        g_a_integrals[:] = np.asarray(g_a_vals)
+        Ψ_T = np.asarray(Ψ_T)
+    for (i_pulse, pulse) in enumerate(optimized_pulses):
+        pulse[:] = pulses[i_pulse]
+    if second_order:
+        forward_vecs = np.asarray(forward_vecs)
+        forward_states = [
+            _DenseStateStorage.from_vectors(forward_vecs[k], obj.initial_state)
+            for (k, obj) in enumerate(objectives)
+        ]
+        fw_states = [states[-1] for states in forward_states]
+    else:
+        forward_vecs = None
+        fw_states = [
+            _DenseStateStorage.from_vectors(Ψ[None], obj.initial_state)[0]
+            for (Ψ, obj) in zip(Ψ_T, objectives)
+        ]
+    return fw_states, forward_vecs, forward_states
+
+
 def _forward_propagation_step(
     i_state,
     states,
@@ -896,17 +2238,25 @@ def _forward_propagation_step(
     tlist,
     time_index,
     propagators,
+    operators=None,
+    dts=None,
 ):
-    """Forward-propagate states[i_state] by a single time step"""
+    """Forward-propagate states[i_state] by a single time step
+
+    If given, `operators` must be the result of :func:`_plugged_in_operators`
+    for `time_index`, and `dts` the array of time steps in `tlist`.
+    """
     state = states[i_state]
-    obj = objectives[i_state]
-    mapping = pulses_mapping[i_state]
-    H = plug_in_pulse_values(obj.H, pulses, mapping[0], time_index)
-    c_ops = [
-        plug_in_pulse_values(c_op, pulses, mapping[ic + 1], time_index)
-        for (ic, c_op) in enumerate(obj.c_ops)
-    ]
-    dt = tlist[time_index + 1] - tlist[time_index]
+    if operators is None:
+        obj = objectives[i_state]
+        mapping = pulses_mapping[i_state]
+        H, c_ops = _plug_in(obj, pulses, mapping, time_index)
+    else:
+        H, c_ops = operators[i_state]
+    if dts is None:
+        dt = tlist[time_index + 1] - tlist[time_index]
+    else:
+        dt = dts[time_index]
     return propagators[i_state](
         H, state, dt, c_ops, initialize=(time_index == 0)
     )
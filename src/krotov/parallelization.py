@@ -46,6 +46,29 @@ communication overhead as much as possible. However, the internal caching is
 valid only under the assumption that the `propagate` function does not have
 side effects.
 
+Alternatively, the third element of the `parallel_map` tuple may be given as
+the string 'threads'. In this case, there is no "map" over the objectives in
+every time step: instead, each objective is forward-propagated in its own
+thread, over the entire time grid. The threads synchronize only once per time
+step, at a :class:`threading.Barrier`, where the contributions of all
+objectives to the pulse update are combined. This reduces the dispatch overhead
+from one task per objective and time step to one task per objective, and has no
+inter-process communication at all. It only results in a speedup if the
+`propagate` function releases the GIL for most of its runtime (as is the case
+for numerical routines in :mod:`numpy` or :mod:`scipy` operating on
+sufficiently large arrays), and requires that the propagators of the different
+objectives may run concurrently. Note that
+:class:`~krotov.propagators.DensityMatrixODEPropagator` is not re-entrant.
+
+The string 'threads' may also be used for the propagations (1) and (2), or
+passed as `parallel_map` instead of a tuple, to use threads for all three
+propagations. The same pool of threads is used for all propagations, and is
+kept alive for the entire optimization, so that the overhead of starting
+threads is incurred only once. The pool has one thread per objective if
+'threads' is used for the propagation (3), and no more threads than CPUs
+otherwise. The default remains
+serial execution, as custom propagators are not necessarily thread-safe.
+
 In general,
 
 .. code-block:: python
@@ -299,6 +322,25 @@ def parallel_map(
     return res
 
 
+def _executor_map(
+    executor, task, values, task_args=None, task_kwargs=None, **kwargs
+):
+    """Map `task` over `values`, using the given `executor`.
+
+    Same interface as :func:`qutip.parallel.serial_map` (with the `executor`
+    as an additional first argument), but without support for a progress bar.
+    """
+    if task_args is None:
+        task_args = ()
+    if task_kwargs is None:
+        task_kwargs = {}
+    futures = [
+        executor.submit(task, value, *task_args, **task_kwargs)
+        for value in values
+    ]
+    return [future.result() for future in futures]
+
+
 def _process_threadpool_limits_initializier():
     """Initializer for settings threadpool limits.
 
@@ -401,7 +443,7 @@ class FwPropStepTask:
             tlist,
             _,  # time_index
             propagators,
-        ) = data
+        ) = data[:7]
         # the data is passed by the Consumer, and is cached locally inside of
         # each process. Thus, it does not contribute to the IPC communication
         # overhead
@@ -442,7 +484,7 @@ def parallel_map_fw_prop_step(shared, values, task_args):
             performing a forward-propagation), but here, it is (ab-)used as a
             storage object only.
         values (list): a list 0..(N-1) where N is the number of objectives
-        task_args (tuple): A tuple of 7 components:
+        task_args (tuple): A tuple of 9 components:
 
             1. A list of states to propagate, one for each objective.
             2. The list of objectives
@@ -455,6 +497,11 @@ def parallel_map_fw_prop_step(shared, values, task_args):
                :func:`.optimize_pulses`.  The propagators must not have
                side-effects in order for :func:`parallel_map_fw_prop_step` to
                work correctly.
+            8. Either None, or a list of the Hamiltonians and collapse
+               operators for each objective, with the pulse values at
+               `time_index` already plugged in. This is a shortcut for
+               objectives sharing the same operators, and is ignored here.
+            9. The array of time steps for the intervals of the time grid
     """
     # `shared` is the original task function
     # (krotov.optimize._forward_propagation_step), but here we abuse it
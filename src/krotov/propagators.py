@@ -67,6 +67,7 @@ from abc import ABC, abstractmethod
 import numpy as np
 import qutip
 import scipy
+import scipy.linalg
 import threadpoolctl
 from qutip.cy.spconvert import dense2D_to_fastcsr_fmode
 from qutip.cy.spmatfuncs import spmvpy_csr
@@ -76,6 +77,27 @@ from qutip.superoperator import mat2vec, vec2mat
 __all__ = ['expm', 'Propagator', 'DensityMatrixODEPropagator']
 
 
+_THREADPOOL_CONTROLLER = None
+
+
+def _single_threaded():
+    """Context manager that limits BLAS/OpenMP thread pools to one thread.
+
+    Creating a :func:`threadpoolctl.threadpool_limits` context inspects all
+    loaded shared libraries, which is far more expensive than a propagation
+    step for small systems. Thus, the libraries are inspected only once, and
+    the resulting controller is re-used (if supported by the installed
+    version of threadpoolctl).
+    """
+    global _THREADPOOL_CONTROLLER
+    try:
+        if _THREADPOOL_CONTROLLER is None:
+            _THREADPOOL_CONTROLLER = threadpoolctl.ThreadpoolController()
+        return _THREADPOOL_CONTROLLER.limit(limits=1)
+    except AttributeError:  # threadpoolctl < 3.0
+        return threadpoolctl.threadpool_limits(limits=1)
+
+
 def expm(H, state, dt, c_ops=None, backwards=False, initialize=False):
     """Propagate using matrix exponentiation.
 
@@ -91,35 +113,44 @@ def expm(H, state, dt, c_ops=None, backwards=False, initialize=False):
     if len(c_ops) > 0:
         raise NotImplementedError("Liouville exponentiation not implemented")
     assert isinstance(H, list) and len(H) > 0
-    eqm_factor = -1j  # factor in front of H on rhs of the equation of motion
     if isinstance(H[0], list):
-        if H[0][1].type == 'super':
-            eqm_factor = 1
-        if backwards:
-            eqm_factor = eqm_factor.conjugate()
-        A = (eqm_factor * H[0][1]) * H[0][0]
+        A_type = H[0][0].type
     else:
-        if H[0].type == 'super':
-            eqm_factor = 1
-        if backwards:
-            eqm_factor = eqm_factor.conjugate()
-        A = eqm_factor * H[0]
-    for part in H[1:]:
-        if isinstance(part, list):
-            A += (eqm_factor * part[1]) * part[0]
-        else:
-            A += eqm_factor * part
-    ok_types = (state.type == 'oper' and A.type == 'super') or (
-        state.type in ['ket', 'bra'] and A.type == 'oper'
+        A_type = H[0].type
+    eqm_factor = -1j  # factor in front of H on rhs of the equation of motion
+    if A_type == 'super':
+        eqm_factor = 1
+    if backwards:
+        eqm_factor = eqm_factor.conjugate()
+    ok_types = (state.type == 'oper' and A_type == 'super') or (
+        state.type == 'ket' and A_type == 'oper'
     )
-    if ok_types:
-        with threadpoolctl.threadpool_limits(limits=1):
-            return ((A * dt).expm())(state)
-    else:
+    if not ok_types:
         raise NotImplementedError(
             "Cannot handle argument types A:%s, state:%s"
-            % (A.type, state.type)
+            % (A_type, state.type)
         )
+    # Sum up the generator directly from the sparse data of the operators, and
+    # apply its exponential to the dense state data, instead of going through
+    # the arithmetic of many intermediary Qobj instances
+    A = None
+    for part in H:
+        if isinstance(part, list):
+            term = (eqm_factor * part[1]) * part[0].data
+        else:
+            term = eqm_factor * part.data
+        A = term if A is None else A + term
+    with _single_threaded():
+        U = scipy.linalg.expm((A * dt).toarray())
+        if state.type == 'oper':
+            rho = state.full()
+            data = (U @ rho.ravel(order='F')).reshape(rho.shape, order='F')
+        else:
+            data = U @ state.full()
+    return qutip.Qobj(
+        dense2D_to_fastcsr_fmode(np.asfortranarray(data), *data.shape),
+        dims=state.dims,
+    )
 
 
 class Propagator(ABC):
@@ -9,6 +9,7 @@ from shutil import copyfile
 import numpy as np
 import pytest
 import qutip
+import scipy.sparse
 from pkg_resources import parse_version
 
 import krotov
@@ -526,3 +527,346 @@ def test_continue_optimization(
             store_all_pulses=True,
         )
     assert "only possible from a Result object" in str(exc_info.value)
+
+
+def test_dense_state_storage():
+    """Test that the default storage returns the stored Qobj states."""
+    rho = qutip.rand_dm(4, dims=[[2, 2], [2, 2]])
+    psi = qutip.tensor(qutip.ket('0'), qutip.ket('1'))
+    storage = krotov.optimize._DenseStateStorage(3)
+    assert len(storage) == 3
+    assert storage[0] is None
+    storage[0] = rho
+    storage[-1] = 2 * rho
+    assert storage.vectors.shape == (3, 16)
+    assert (storage[0] - rho).norm() < 1e-14
+    assert (storage[2] - 2 * rho).norm() < 1e-14
+    assert storage[2].dims == rho.dims
+    storage = krotov.optimize._DenseStateStorage(2)
+    storage[0] = psi
+    storage[1] = psi
+    assert [state.dims for state in storage] == [psi.dims, psi.dims]
+    storage[1] = 'not a state'  # switches to storing objects
+    assert storage.vectors is None
+    assert storage[0] == psi
+    assert storage[1] == 'not a state'
+
+
+def test_dense_storage_arrays():
+    """Test that the preallocated storage arrays use the rows of a single
+    array."""
+    psi = qutip.tensor(qutip.ket('0'), qutip.ket('1'))
+    states = [psi, qutip.tensor(qutip.ket('1'), qutip.ket('1'))]
+    vectors, storage_arrays = krotov.optimize._dense_storage_arrays(states, 3)
+    assert vectors.shape == (2, 3, 4)
+    for (k, states_k) in enumerate(storage_arrays):
+        states_k[0] = states[k]
+    assert np.all(vectors[:, 0] == [s.full().ravel() for s in states])
+    assert storage_arrays[1][0].dims == psi.dims
+    dense_vectors = krotov.optimize._dense_vectors
+    assert dense_vectors(vectors, storage_arrays, storage_arrays) is vectors
+    copies = [deepcopy(states_k) for states_k in storage_arrays]
+    assert dense_vectors(vectors, storage_arrays, copies) is None
+    storage_arrays[1][2] = 'not a state'
+    assert dense_vectors(vectors, storage_arrays, storage_arrays) is None
+    assert krotov.optimize._dense_storage_arrays([psi, psi.dag()], 3) == (
+        None,
+        None,
+    )
+
+
+@pytest.mark.parametrize('parallel_map', [None, 'threads'])
+@pytest.mark.parametrize('second_order', [True, False])
+def test_custom_storage(
+    parallel_map, second_order, simple_state_to_state_system
+):
+    """Test that an optimization with a custom `storage` matches the default
+    storage."""
+    objectives, pulse_options, tlist = simple_state_to_state_system
+    sigma = _ConstantSigma() if second_order else None
+    storage_types = []
+
+    def store_storage_type(**kwargs):
+        if kwargs['backward_states'] is not None:
+            storage_types.append(type(kwargs['backward_states'][0]))
+
+    results = [
+        krotov.optimize_pulses(
+            objectives,
+            pulse_options=pulse_options,
+            tlist=tlist[:100],
+            propagator=krotov.propagators.expm,
+            chi_constructor=krotov.functionals.chis_re,
+            sigma=sigma,
+            iter_stop=2,
+            info_hook=store_storage_type,
+            storage=storage,
+            parallel_map=parallel_map,
+        )
+        for storage in ('array', lambda N: np.empty(N, dtype=object))
+    ]
+    assert (
+        storage_types
+        == [krotov.optimize._DenseStateStorage] * 2 + [np.ndarray] * 2
+    )
+    assert np.allclose(
+        results[0].optimized_controls[0],
+        results[1].optimized_controls[0],
+        rtol=1e-12,
+        atol=1e-14,
+    )
+
+
+def test_batched_pulse_update(simple_state_to_state_system):
+    """Test that the batched pulse update for the default `mu` gives the same
+    result as the update for one objective at a time."""
+    objectives, pulse_options, tlist = simple_state_to_state_system
+    objectives = objectives + [
+        krotov.Objective(
+            initial_state=qutip.ket('1'),
+            target=qutip.ket('0'),
+            H=objectives[0].H,
+        )
+    ]
+    tlist = tlist[:100]
+
+    def mu(*args):
+        # A custom `mu` disables the batched update
+        return krotov.mu.derivative_wrt_pulse(*args)
+
+    results = [
+        krotov.optimize_pulses(
+            objectives,
+            pulse_options=pulse_options,
+            tlist=tlist,
+            propagator=krotov.propagators.expm,
+            chi_constructor=krotov.functionals.chis_sm,
+            mu=_mu,
+            iter_stop=2,
+        )
+        for _mu in (None, mu)
+    ]
+    assert np.allclose(
+        results[0].optimized_controls[0],
+        results[1].optimized_controls[0],
+        rtol=1e-12,
+        atol=1e-14,
+    )
+    assert np.max(np.abs(results[0].optimized_controls[0] - 0.2)) > 1e-3
+
+
+@pytest.mark.parametrize('second_order', [True, False])
+def test_batched_update_kernels(second_order):
+    """Test that the explicit-loop kernel for the pulse update (compiled with
+    numba, if available) and the kernel for sparse μ match the numpy
+    implementation."""
+    rng = np.random.default_rng(seed=1)
+    n_pulses, n_obj, dim = 2, 3, 4
+
+    def random_complex(*shape):
+        return rng.normal(size=shape) + 1j * rng.normal(size=shape)
+
+    args = (
+        random_complex(n_obj, dim),
+        random_complex(n_pulses, n_obj, dim, dim),
+        random_complex(n_obj, dim),
+        rng.random(n_obj),
+        random_complex(n_obj, dim),
+        0.3,
+        second_order,
+    )
+    expected = krotov.optimize._batched_update_einsum(*args)
+    assert expected.shape == (n_pulses,)
+    for kernel in (
+        krotov.optimize._batched_update_loops,
+        krotov.optimize._batched_update,
+    ):
+        assert np.allclose(kernel(*args), expected, rtol=1e-12, atol=1e-14)
+    sparse_mu_stacks = [
+        [scipy.sparse.csr_matrix(μ) for μ in μ_stack] for μ_stack in args[1]
+    ]
+    sparse_args = args[:1] + (sparse_mu_stacks,) + args[2:]
+    assert np.allclose(
+        krotov.optimize._batched_update_sparse(*sparse_args),
+        expected,
+        rtol=1e-12,
+        atol=1e-14,
+    )
+
+
+def test_shared_operators(simple_state_to_state_system):
+    """Test that objectives sharing the same Hamiltonian give the same result
+    as objectives with separate (but identical) Hamiltonians"""
+    objectives, pulse_options, tlist = simple_state_to_state_system
+    obj = objectives[0]
+    H = obj.H
+    H_copy = [H[0].copy(), [H[1][0].copy(), H[1][1]]]
+    shared_objectives = [
+        obj,
+        krotov.Objective(
+            initial_state=obj.target, target=obj.initial_state, H=H
+        ),
+    ]
+    separate_objectives = [
+        obj,
+        krotov.Objective(
+            initial_state=obj.target, target=obj.initial_state, H=H_copy
+        ),
+    ]
+    assert krotov.optimize._operator_groups(shared_objectives) == [0, 0]
+    assert krotov.optimize._operator_groups(separate_objectives) is None
+    results = [
+        krotov.optimize_pulses(
+            objectives,
+            pulse_options=pulse_options,
+            tlist=tlist[:100],
+            propagator=krotov.propagators.expm,
+            chi_constructor=krotov.functionals.chis_re,
+            iter_stop=2,
+        )
+        for objectives in (shared_objectives, separate_objectives)
+    ]
+    assert np.allclose(
+        results[0].optimized_controls[0],
+        results[1].optimized_controls[0],
+        rtol=1e-12,
+        atol=1e-14,
+    )
+
+
+def test_batched_tau_vals():
+    """Test that the batched calculation of τ matches the overlaps for the
+    individual objectives"""
+    kets = [qutip.rand_ket(4) for _ in range(3)]
+    rhos = [qutip.rand_dm(4) for _ in range(3)]
+    for (targets, states) in [(kets, kets[::-1]), (rhos, rhos[::-1])]:
+        objectives = [
+            krotov.Objective(
+                initial_state=state, target=target, H=qutip.qeye(4)
+            )
+            for (state, target) in zip(states, targets)
+        ]
+        targets_stack = krotov.optimize._stacked_targets(objectives)
+        assert targets_stack.shape == (3, 16 if targets is rhos else 4)
+        tau_vals = krotov.optimize._tau_vals(
+            objectives, states, krotov.second_order._overlap, targets_stack
+        )
+        expected = [
+            krotov.second_order._overlap(obj.target, state)
+            for (state, obj) in zip(states, objectives)
+        ]
+        assert np.allclose(tau_vals, expected, rtol=1e-12, atol=1e-14)
+    objectives[0].target = 'PE'
+    assert krotov.optimize._stacked_targets(objectives) is None
+
+
+class _ConstantSigma(krotov.second_order.Sigma):
+    def __call__(self, t):
+        return -0.3
+
+    def refresh(self, **kwargs):
+        pass
+
+
+@pytest.mark.parametrize('second_order', [True, False])
+def test_jax_backend(second_order, simple_state_to_state_system):
+    """Test that the optimization with backend='jax' matches the default
+    backend"""
+    pytest.importorskip('jax')
+    objectives, pulse_options, tlist = simple_state_to_state_system
+    sigma = _ConstantSigma() if second_order else None
+    results = [
+        krotov.optimize_pulses(
+            objectives,
+            pulse_options=pulse_options,
+            tlist=tlist[:100],
+            propagator=krotov.propagators.expm,
+            chi_constructor=krotov.functionals.chis_re,
+            sigma=sigma,
+            iter_stop=2,
+            backend=backend,
+        )
+        for backend in ('numpy', 'jax')
+    ]
+    assert np.allclose(
+        results[0].optimized_controls[0],
+        results[1].optimized_controls[0],
+        rtol=1e-12,
+        atol=1e-14,
+    )
+    assert np.allclose(
+        results[0].tau_vals[-1], results[1].tau_vals[-1], rtol=1e-12
+    )
+    with pytest.raises(ValueError):
+        krotov.optimize_pulses(
+            objectives,
+            pulse_options=pulse_options,
+            tlist=tlist[:100],
+            propagator=krotov.propagators.DensityMatrixODEPropagator(),
+            chi_constructor=krotov.functionals.chis_re,
+            iter_stop=1,
+            backend='jax',
+        )
+    # a time-dependency in H that is not in the pulses mapping
+    pulses = [np.zeros(99)]
+    with pytest.raises(ValueError) as exc_info:
+        krotov.optimize._check_jax_backend(
+            objectives,
+            pulses,
+            [[[[]]]],
+            [krotov.propagators.expm],
+            krotov.optimize._DenseStateStorage,
+            krotov.mu.derivative_wrt_pulse,
+            krotov.second_order._overlap,
+            np.complex128,
+        )
+    assert 'time-dependencies' in str(exc_info.value)
+
+
+def test_complex64_dtype(simple_state_to_state_system):
+    """Test that an optimization with single-precision storage matches the
+    default double precision, up to single precision"""
+    objectives, pulse_options, tlist = simple_state_to_state_system
+    dtypes = []
+
+    def store_dtype(**kwargs):
+        if kwargs['backward_states'] is not None:
+            dtypes.append(kwargs['backward_states'][0].vectors.dtype)
+
+    results = [
+        krotov.optimize_pulses(
+            objectives,
+            pulse_options=pulse_options,
+            tlist=tlist[:100],
+            propagator=krotov.propagators.expm,
+            chi_constructor=krotov.functionals.chis_re,
+            iter_stop=2,
+            info_hook=store_dtype,
+            dtype=dtype,
+        )
+        for dtype in (np.complex128, np.complex64)
+    ]
+    assert dtypes == [np.complex128] * 2 + [np.complex64] * 2
+    assert np.allclose(
+        results[0].optimized_controls[0],
+        results[1].optimized_controls[0],
+        rtol=1e-5,
+        atol=1e-7,
+    )
+    assert results[1].tau_vals[-1].dtype == np.complex128
+    # the initial forward propagation is in double precision
+    assert np.allclose(
+        results[0].tau_vals[0], results[1].tau_vals[0], rtol=1e-14, atol=0
+    )
+    for dtype in (np.float32, np.float64, int, np.clongdouble):
+        with pytest.raises(ValueError) as exc_info:
+            krotov.optimize_pulses(
+                objectives,
+                pulse_options=pulse_options,
+                tlist=tlist[:100],
+                propagator=krotov.propagators.expm,
+                chi_constructor=krotov.functionals.chis_re,
+                iter_stop=2,
+                dtype=dtype,
+            )
+        assert 'complex' in str(exc_info.value)
@@ -1,11 +1,13 @@
 """Tests of krotov.parallelization."""
 import io
+import threading
 from functools import partial
 
 import numpy as np
 import pytest
 import qutip
 import scipy
+import threadpoolctl
 
 import krotov
 import transmon_xgate_system_mod
@@ -169,3 +171,149 @@ def test_parallel_map_fw_prop_step_loky(transmon_xgate_system):
     except RuntimeError:
         # parallelization without LOKY doesn't work on all platforms
         pass
+
+
+def test_threaded_fw_prop(transmon_xgate_system):
+    """Test that propagating each objective in its own thread gives the same
+    result as the serial forward propagation."""
+    objectives, pulse_options, tlist = transmon_xgate_system
+    results = [
+        krotov.optimize_pulses(
+            objectives,
+            pulse_options,
+            tlist,
+            propagator=krotov.propagators.expm,
+            chi_constructor=krotov.functionals.chis_re,
+            iter_stop=2,
+            parallel_map=(
+                krotov.parallelization.serial_map,
+                krotov.parallelization.serial_map,
+                fw_map,
+            ),
+        )
+        for fw_map in (krotov.parallelization.serial_map, 'threads')
+    ]
+    assert (
+        np.max(np.abs(results[0].tau_vals[-1] - results[1].tau_vals[-1]))
+        < 1e-12
+    )
+    assert (
+        np.max(
+            np.abs(
+                results[0].optimized_controls[0]
+                - results[1].optimized_controls[0]
+            )
+        )
+        < 1e-12
+    )
+
+
+def test_threads_pool(transmon_xgate_system):
+    """Test that running all propagations in a thread pool gives the same
+    result as the serial optimization."""
+    objectives, pulse_options, tlist = transmon_xgate_system
+    results = [
+        krotov.optimize_pulses(
+            objectives,
+            pulse_options,
+            tlist,
+            propagator=krotov.propagators.expm,
+            chi_constructor=krotov.functionals.chis_re,
+            iter_stop=2,
+            parallel_map=parallel_map,
+        )
+        for parallel_map in (None, 'threads')
+    ]
+    assert (
+        np.max(
+            np.abs(
+                results[0].optimized_controls[0]
+                - results[1].optimized_controls[0]
+            )
+        )
+        < 1e-12
+    )
+    with pytest.raises(ValueError):
+        krotov.optimize_pulses(
+            objectives,
+            pulse_options,
+            tlist,
+            propagator=krotov.propagators.expm,
+            chi_constructor=krotov.functionals.chis_re,
+            iter_stop=1,
+            parallel_map='processes',
+        )
+
+
+def test_threads_pool_shutdown_on_error(transmon_xgate_system):
+    """Test that the pool of threads for parallel_map='threads' is shut down
+    if the optimization raises an exception."""
+    objectives, pulse_options, tlist = transmon_xgate_system
+
+    def failing_info_hook(**kwargs):
+        raise RuntimeError("info_hook failed")
+
+    with pytest.raises(RuntimeError):
+        krotov.optimize_pulses(
+            objectives,
+            pulse_options,
+            tlist,
+            propagator=krotov.propagators.expm,
+            chi_constructor=krotov.functionals.chis_re,
+            info_hook=failing_info_hook,
+            iter_stop=1,
+            parallel_map='threads',
+        )
+    assert not any(
+        thread.name.startswith('krotov') for thread in threading.enumerate()
+    )
+
+
+@pytest.mark.parametrize(
+    'parallel_map',
+    [
+        ('threads', 'threads', qutip.parallel.serial_map),
+        'threads',
+    ],
+)
+def test_threads_pool_size(parallel_map, transmon_xgate_system, monkeypatch):
+    """Test that the pool of threads for parallel_map='threads' has one thread
+    per objective only for the threaded forward propagation."""
+    objectives, pulse_options, tlist = transmon_xgate_system
+    assert len(objectives) > 1
+    monkeypatch.setattr(krotov.optimize.os, 'cpu_count', lambda: 1)
+    n_threads = []
+
+    def count_threads(**kwargs):
+        n_threads.append(
+            sum(
+                thread.name.startswith('krotov')
+                for thread in threading.enumerate()
+            )
+        )
+
+    krotov.optimize_pulses(
+        objectives,
+        pulse_options,
+        tlist,
+        propagator=krotov.propagators.expm,
+        chi_constructor=krotov.functionals.chis_re,
+        info_hook=count_threads,
+        iter_stop=1,
+        parallel_map=parallel_map,
+    )
+    if parallel_map == 'threads':
+        assert n_threads[-1] == len(objectives)
+    else:
+        assert max(n_threads) == 1
+
+
+def test_expm_single_threaded():
+    """Test that the context for single-threaded matrix exponentiation can be
+    re-used, and limits all thread pools"""
+    for _ in range(2):
+        with krotov.propagators._single_threaded():
+            controller = krotov.propagators._THREADPOOL_CONTROLLER
+            assert isinstance(controller, threadpoolctl.ThreadpoolController)
+            for info in controller.info():
+                assert info['num_threads'] == 1
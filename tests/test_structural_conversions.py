@@ -263,3 +263,31 @@ def test_control_tlist_calculation():
     assert midpoints[0] == 0.5
     assert midpoints[1] == 1.5
     assert midpoints[2] == 2.1
+
+
+def test_shape_arrays_on_midpoints():
+    """Test that the update shapes are sampled directly on the intervals of
+    the time grid, consistent with `discretize(..., via_midpoints=True)`"""
+    H = [qutip.Qobj(), [qutip.Qobj(), lambda t, args: 0]]
+    u = H[1][1]
+    objectives = [
+        krotov.Objective(initial_state=qutip.Qobj(), target=None, H=H)
+    ]
+    tlist = np.linspace(0, 10, 500)
+
+    def S(t):
+        return krotov.shapes.flattop(
+            t, t_start=0, t_stop=10, t_rise=1, func='sinsq'
+        )
+
+    res = krotov.optimize._initialize_krotov_controls(
+        objectives, {u: dict(lambda_a=1, update_shape=S)}, tlist
+    )
+    shape_arrays = res[4]
+    assert shape_arrays.shape == (1, len(tlist) - 1)
+    assert shape_arrays[0][0] == 0.0
+    assert shape_arrays[0][-1] == 0.0
+    shape_via_tlist = krotov.conversions.control_onto_interval(
+        discretize(S, tlist, args=(), via_midpoints=True)
+    )
+    assert np.max(np.abs(shape_arrays[0] - shape_via_tlist)) < 1e-12